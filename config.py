@@ -1,10 +1,13 @@
 import datetime
+import hashlib
 import json
 import locale
 import os
+import pickle
 import sys
 from enum import StrEnum, auto
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 from ruamel.yaml import YAML
 
@@ -14,9 +17,10 @@ locale.setlocale(locale.LC_ALL, "de_DE.UTF-8")
 
 from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple, Type
 
-import pytz
+import yaml
 from cachetools import TTLCache, cached
 from pydantic import BaseModel, EmailStr, Field, HttpUrl, model_validator
+from pydantic import version as pydantic_version
 from pydantic.networks import IPvAnyAddress
 from pydantic_extra_types.mac_address import MacAddress
 
@@ -35,6 +39,12 @@ _CONFIGPATH = Path(os.getenv(f"{_PKG}_CONFIG_PATH")) if os.getenv(f"{_PKG}_CONFI
 _CONFIGLOCALPATH: Path = Path(_CONFIGDIRPATH, "config.local.yaml")
 _CONFIGLOCALPATH = Path(os.getenv(f"{_PKG}_CONFIG_LOCAL_PATH")) if os.getenv(f"{_PKG}_CONFIG_LOCAL_PATH") else _CONFIGLOCALPATH  # type: ignore
 
+# pickled Settings-instance, reused as long as the yaml-files, the env and this module are unchanged
+# opt-in only (SOMESTUFF_SETTINGS_CACHE=True): the pickle holds every secret (also env-injected ones) and pickle.load
+# of a tampered file executes arbitrary code
+_SETTINGSCACHEPATH: Path = Path.home() / ".cache" / "somestuff" / "settings.v1.pkl"
+_SETTINGSCACHEPATH = Path(os.getenv(f"{_PKG}_SETTINGS_CACHE_PATH")) if os.getenv(f"{_PKG}_SETTINGS_CACHE_PATH") else _SETTINGSCACHEPATH  # type: ignore
+
 
 from loguru import logger
 from pydantic_settings import (
@@ -44,7 +54,6 @@ from pydantic_settings import (
     InitSettingsSource,
     PydanticBaseSettingsSource,
     SettingsConfigDict,
-    YamlConfigSettingsSource,
 )
 
 # https://buildmedia.readthedocs.org/media/pdf/loguru/latest/loguru.pdf
@@ -99,6 +108,8 @@ class MqttTopic(BaseModel):
     # submodulename: str
     topic: str
     subscribe: bool = False
+    # qos=1 costs a PUBACK roundtrip per message -> only worth it for the values which must not get lost
+    qos: Literal[0, 1, 2] = 0
 
 
 class MqttTopics(BaseModel):
@@ -204,12 +215,34 @@ class Hydromail(BaseModel):
     mailrecipients_cc: List[EmailStr]
 
 
+# libyaml-backed loader if PyYAML was built with it -> pure-python SafeLoader otherwise
+_YamlSafeLoader: Type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class CSafeYamlConfigSettingsSource(InitSettingsSource):
+    """Settings-source for ``yaml_files``, parsed with ``yaml.CSafeLoader`` (if available).
+
+    Same merge as pydantic-settings' YamlConfigSettingsSource (missing files are skipped, later files replace top-level
+    keys), but built on the public ``InitSettingsSource(settings_cls, init_kwargs)`` -> no private hook overridden.
+    """
+
+    def __init__(self, settings_cls: Type[BaseSettings], yaml_files: List[Path], encoding: str = "utf-8") -> None:
+        data: Dict[str, Any] = {}
+        for yaml_file in yaml_files:
+            path: Path = yaml_file.expanduser()
+            if not path.is_file():
+                continue
+            with path.open(encoding=encoding) as f:
+                data.update(yaml.load(f, Loader=_YamlSafeLoader) or {})
+
+        super().__init__(settings_cls, data)
+
+
 class Settings(BaseSettings):
     model_config: ClassVar[SettingsConfigDict] = SettingsConfigDict(
         populate_by_name=True,
         # env_prefix="TAS_",
         case_sensitive=False,
-        yaml_file_encoding="utf-8",
         extra="ignore",  # ignore | forbid | allow
         protected_namespaces=(),
         env_nested_delimiter="__",
@@ -217,7 +250,6 @@ class Settings(BaseSettings):
         #     validation_alias=to_camel,
         #     serialization_alias=to_pascal,
         # )
-        yaml_file=[_CONFIGPATH, _CONFIGLOCALPATH],
     )
 
     # emailsettings: EmailSettings
@@ -242,7 +274,7 @@ class Settings(BaseSettings):
         dotenv_settings: DotEnvSettingsSource,  # type: ignore
         file_secret_settings: PydanticBaseSettingsSource,
     ) -> Tuple[PydanticBaseSettingsSource, ...]:
-        return init_settings, env_settings, YamlConfigSettingsSource(settings_cls)
+        return init_settings, env_settings, CSafeYamlConfigSettingsSource(settings_cls, [_CONFIGPATH, _CONFIGLOCALPATH])
 
 
 def str2bool(v: str | bool) -> bool:
@@ -263,7 +295,67 @@ def is_in_cluster() -> bool:
     return False
 
 
+def _settings_fingerprint() -> str:
+    """Fingerprint of everything a ``Settings()`` instantiation depends on.
+
+    Covers path/mtime/size of both yaml-files and of this module, the pydantic version and all env-vars which may
+    override a settings-field (case-insensitive, nested via ``__``).
+    """
+    parts: List[Any] = [__name__, pydantic_version.VERSION]
+    for p in (Path(__file__), _CONFIGPATH, _CONFIGLOCALPATH):
+        try:
+            st: os.stat_result = os.stat(p)
+            parts.append((str(p), st.st_mtime_ns, st.st_size))
+        except OSError:
+            parts.append((str(p), None, None))
+
+    fieldnames: set[str] = {k.lower() for k in Settings.model_fields}
+    parts.append(sorted((k.lower(), v) for k, v in os.environ.items() if k.lower().split("__", 1)[0] in fieldnames))
+
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _load_settings() -> Settings:
+    """Returns the pickled ``Settings`` from ``_SETTINGSCACHEPATH`` if its fingerprint still matches, else builds
+    (and caches) a fresh one.
+
+    Opt-in via ``SOMESTUFF_SETTINGS_CACHE=True`` -> the cache file contains all credentials (including the ones only
+    injected via env) and is unpickled on load, so only enable it where ``_SETTINGSCACHEPATH`` is private to the user.
+    """
+    if not str2bool(os.getenv(f"{_PKG}_SETTINGS_CACHE", "False")):
+        return Settings()  # type: ignore
+
+    fingerprint: str = _settings_fingerprint()
+
+    try:
+        with open(_SETTINGSCACHEPATH, "rb") as f:
+            cached_fingerprint, cached_settings = pickle.load(f)
+        if cached_fingerprint == fingerprint and isinstance(cached_settings, Settings):
+            logger.debug(f"using cached settings from {_SETTINGSCACHEPATH}")
+            return cached_settings
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.opt(exception=e).warning(f"Error loading cached settings: {_SETTINGSCACHEPATH}")
+
+    ret: Settings = Settings()  # type: ignore
+
+    try:
+        _SETTINGSCACHEPATH.parent.mkdir(parents=True, exist_ok=True)
+        tmppath: Path = _SETTINGSCACHEPATH.with_name(f"{_SETTINGSCACHEPATH.name}.{os.getpid()}.tmp")
+        # contains credentials -> only readable by the owner
+        with os.fdopen(os.open(tmppath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+            pickle.dump((fingerprint, ret), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmppath, _SETTINGSCACHEPATH)
+    except Exception as e:
+        logger.opt(exception=e).warning(f"Error writing cached settings: {_SETTINGSCACHEPATH}")
+
+    return ret
+
+
 def log_settings() -> None:
+    export_psql_env()
+
     for k, v in os.environ.items():
         if k.startswith("PSQL_"):
             logger.info(f"ENV::{k}: {v}")
@@ -274,24 +366,34 @@ def log_settings() -> None:
     logger.info(json.dumps(settings.model_dump(by_alias=True), indent=4, sort_keys=False, default=str))
 
 
-settings: Settings = Settings()  # type: ignore
+settings: Settings = _load_settings()
 
-if settings.postgresql.url:
-    os.environ["PSQL_DB_URL"] = os.getenv("PSQL_DB_URL", settings.postgresql.url)
 
-os.environ["PSQL_DB_HOST"] = os.getenv("PSQL_DB_HOST", settings.postgresql.host_in_cluster if is_in_cluster() else settings.postgresql.host)  # type: ignore
-os.environ["PSQL_DB_PORT"] = os.getenv(
-    "PSQL_DB_PORT", str(settings.postgresql.port_in_cluster if is_in_cluster() else settings.postgresql.port)
-)
-os.environ["PSQL_DB_USERNAME"] = os.getenv("PSQL_DB_USERNAME", settings.postgresql.username)
-os.environ["PSQL_DB_PASSWORD"] = os.getenv("PSQL_DB_PASSWORD", settings.postgresql.password)
-os.environ["PSQL_DB_NAME"] = os.getenv("PSQL_DB_NAME", settings.postgresql.dbname)
+def export_psql_env() -> None:
+    """Populates the ``PSQL_DB_*`` env-vars (if not already set) from ``settings.postgresql``.
+
+    Not done at import anymore -> call this from entrypoints which actually hand the db-connection to env-based
+    consumers.
+    """
+    if settings.postgresql.url:
+        os.environ["PSQL_DB_URL"] = os.getenv("PSQL_DB_URL", settings.postgresql.url)
+
+    in_cluster: bool = is_in_cluster()
+    os.environ["PSQL_DB_HOST"] = os.getenv("PSQL_DB_HOST", settings.postgresql.host_in_cluster if in_cluster else settings.postgresql.host)  # type: ignore
+    os.environ["PSQL_DB_PORT"] = os.getenv(
+        "PSQL_DB_PORT", str(settings.postgresql.port_in_cluster if in_cluster else settings.postgresql.port)
+    )
+    os.environ["PSQL_DB_USERNAME"] = os.getenv("PSQL_DB_USERNAME", settings.postgresql.username)
+    os.environ["PSQL_DB_PASSWORD"] = os.getenv("PSQL_DB_PASSWORD", settings.postgresql.password)
+    os.environ["PSQL_DB_NAME"] = os.getenv("PSQL_DB_NAME", settings.postgresql.dbname)
+
 
 TEMPLATEDIRPATH: Path = Path(__file__).parent.resolve()
 TEMPLATEDIRPATH = Path(TEMPLATEDIRPATH, "templates")
 logger.debug(f"TEMPLATEDIRPATH: {TEMPLATEDIRPATH}")
 
-TIMEZONE: datetime.tzinfo = pytz.timezone(settings.timezone)
+# stdlib zoneinfo (C-accelerated, PEP 615) instead of pytz -> also correct with datetime.replace()/arithmetic
+TIMEZONE: datetime.tzinfo = ZoneInfo(settings.timezone)
 logger.debug(f"TIMEZONE: {TIMEZONE}")
 
 
@@ -6,8 +6,6 @@ from datetime import timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import pytz
-
 # https://github.com/dbader/schedule
 import schedule
 from mqttstuff import MosquittoClientWrapper, MWMqttMessage
@@ -15,10 +13,10 @@ from schedule import run_pending
 
 import Helper
 from config import _EFFECTIVE_CONFIG as effconfig  # dirty.
-from config import settings
+from config import TIMEZONE, settings
 from ecowittstuff.ecowittapi import WeatherStationResponse, get_realtime_data
 
-_tzberlin: datetime.tzinfo = pytz.timezone("Europe/Berlin")
+_tzberlin: datetime.tzinfo = TIMEZONE  # stdlib ZoneInfo (config.TIMEZONE) instead of pytz
 
 from loguru import logger
 
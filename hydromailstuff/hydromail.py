@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 # import pytz
+from cachetools import TTLCache, cached
 from jinja2 import Template
 from loguru import logger
 from mqttstuff.mosquittomqttwrapper import MQTTLastDataReader, MWMqttMessage
@@ -11,12 +12,12 @@ from reputils import EmailAddress, MRSendmail, SendResult, SMTPServerInfo
 
 import config
 import Helper
+import netatmostuff.lnetatmo as lnetatmo
 from config import TIMEZONE, is_in_cluster, settings
-from netatmostuff.Crontanamo import ensure_up2date_netatmo_credentialsfile
-
-# from netatmostuff.Crontanamo import write_netatmo_credentials_to_shared_file
-# import netatmostuff.lnetatmo as lnetatmo
-
+from netatmostuff.Crontanamo import (
+    ensure_up2date_netatmo_credentialsfile,
+    write_netatmo_credentials_to_shared_file,
+)
 
 _templatedirpath: Path = Path(__file__).parent.resolve()
 
@@ -26,18 +27,33 @@ mailreplyto: str = os.getenv("MAILREPLYTO", settings.hydromail.mailreplyto)
 mailsubject_base: str = os.getenv("MAILSUBJECT_BASE", settings.hydromail.mailsubject_base)
 
 mailrecipients_to: List[str] = [str(i) for i in settings.hydromail.mailrecipients_to]
-if os.getenv("MAILTOS") is not None and os.getenv("MAILTOS") != "":
-    mailrecipients_to = [i.strip() for i in os.getenv("MAILTOS").split(",")]  # type: ignore
+if mailtos := os.getenv("MAILTOS"):
+    mailrecipients_to = [i.strip() for i in mailtos.split(",")]
 
 mailrecipients_cc: List[str] = [str(i) for i in settings.hydromail.mailrecipients_cc]
-if os.getenv("MAILCCS") is not None and os.getenv("MAILCCS") != "":
-    mailrecipients_cc = [i.strip() for i in os.getenv("MAILCCS").split(",")]  # type: ignore
+if mailccs := os.getenv("MAILCCS"):
+    mailrecipients_cc = [i.strip() for i in mailccs.split(",")]
+
+# recipients do not change at runtime -> parse them once
+_TO_ADDRS: Tuple[EmailAddress, ...] = tuple(EmailAddress.from_str(k) for k in mailrecipients_to)
+_CC_ADDRS: Tuple[EmailAddress, ...] = tuple(EmailAddress.from_str(k) for k in mailrecipients_cc)
 
 
 _sdfD_formatstring: str = "%d.%m.%Y"
 _sdfDHM_formatstring: str = "%d.%m.%Y %H:%M"
 _sdfE_formatstring: str = "%Y%m%d"
 
+
+# same output as strftime(_sdfD_formatstring) / strftime(_sdfDHM_formatstring) without the per-call locale/strftime
+# machinery -> used in the per-measure loop of read_netatmo
+def _sdf_d(d: datetime.datetime) -> str:
+    return f"{d.day:02d}.{d.month:02d}.{d.year}"
+
+
+def _sdf_dhm(d: datetime.datetime) -> str:
+    return f"{d.day:02d}.{d.month:02d}.{d.year} {d.hour:02d}:{d.minute:02d}"
+
+
 DISABLE_MAIL_SEND: bool = os.getenv("DISABLE_MAIL_SEND", "False") == "True"
 
 
@@ -73,13 +89,13 @@ def mail_stuff(
             replyto=EmailAddress.from_str(mailreplyto),
             subject=f"{mailsubject_base} :: {sdd}",
         )
-        sendmail.tos = [EmailAddress.from_str(k) for k in mailrecipients_to]
+        sendmail.tos = list(_TO_ADDRS)
 
         # for to in mailrecipients_to:
         #     sendmail.addTo(MailReport.EmailAddress.fromSTR(to))
 
         if mailrecipients_cc is not None:
-            sendmail.ccs = [EmailAddress.from_str(k) for k in mailrecipients_cc]
+            sendmail.ccs = list(_CC_ADDRS)
 
         values: dict = {
             "wasserbisoberkante": wasserbisoberkante,
@@ -106,30 +122,51 @@ def mail_stuff(
             sendmail.send(html=mt_html)
 
 
-def _get_latest_from_mqtt(
-    topic: str, value_fieldname: str, created_at_fieldname: str = "orig_time", noisy: bool = False
-) -> Tuple[float | None, datetime.datetime | None]:
+def _get_latest_payloads_from_mqtt(topics: List[str], noisy: bool = False) -> Dict[str, Dict[str, float | str]]:
+    """Fetches the most recent (also retained) json-payload for each of ``topics`` within ONE mqtt-session.
+
+    If a topic did not show up in that session (e.g. a live message on another topic took its slot), it is
+    fetched separately as a fallback.
+    """
     data_received: List[MWMqttMessage] | None = MQTTLastDataReader.get_most_recent_data_with_timeout(
         host=settings.mqtt.host,
         port=settings.mqtt.port,
         username=settings.mqtt.username,
         password=settings.mqtt.password,
-        topics=topic,
+        topics=topics if len(topics) > 1 else topics[0],
         noisy=noisy,
         retained="yes",  # also get retained messages
+        max_received_msgs=len(topics),
         rettype="json",
         # rettype="valuemsg",
         # created_at_fieldname=created_at_fieldname  # uargs.
     )
 
-    if data_received is None:
-        raise Exception(f"No Data received from MQTT in {topic=}")
+    ret: Dict[str, Dict[str, float | str]] = {}
+    for msg in data_received or []:
+        # first message per topic wins (as with a single-topic read)
+        ret.setdefault(msg.topic, msg.value)  # type: ignore
 
-    logger.debug(f"Data received from MQTT on {topic=}:")
-    data: Dict[str, float | str] = data_received[0].value  # type: ignore
+    for topic in topics:
+        if topic in ret:
+            continue
+
+        if len(topics) == 1:
+            raise Exception(f"No Data received from MQTT in {topic=}")
 
+        logger.debug(f"No Data received from MQTT on {topic=} in batch -> fetching separately")
+        ret[topic] = _get_latest_payloads_from_mqtt([topic], noisy=noisy)[topic]
+
+    return ret
+
+
+def _parse_mqtt_payload(
+    topic: str, data: Dict[str, float | str], value_fieldname: str, created_at_fieldname: str = "orig_time"
+) -> Tuple[float | None, datetime.datetime | None]:
+    logger.debug(f"Data received from MQTT on {topic=}:")
     logger.debug(f"{type(data)=}")
-    logger.debug(Helper.get_pretty_dict_json_no_sort(data, 4))
+    # lazy -> pretty-printing only happens if a DEBUG sink is active
+    logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(data, 4))
 
     retv: float | None = data.get(value_fieldname)  # type: ignore
     ret_dt: datetime.datetime | None = None
@@ -141,6 +178,13 @@ def _get_latest_from_mqtt(
     return retv, ret_dt
 
 
+def _get_latest_from_mqtt(
+    topic: str, value_fieldname: str, created_at_fieldname: str = "orig_time", noisy: bool = False
+) -> Tuple[float | None, datetime.datetime | None]:
+    data: Dict[str, float | str] = _get_latest_payloads_from_mqtt([topic], noisy=noisy)[topic]
+    return _parse_mqtt_payload(topic, data, value_fieldname, created_at_fieldname)
+
+
 def get_current_waterlevel_and_busvoltage_and_ma(
     noisy: bool = False,
 ) -> Tuple[
@@ -148,51 +192,42 @@ def get_current_waterlevel_and_busvoltage_and_ma(
     Tuple[float | None, datetime.datetime | None],
     Tuple[float | None, datetime.datetime | None],
 ]:
-    wasserstand_created_at: datetime.datetime | None
-    wasserstand: float | None
-
-    ma_created_at: datetime.datetime | None
-    ma: float | None
-
-    busvoltage_created_at: datetime.datetime | None
-    busvoltage: float | None
-
-    topic: str
     wasserstandsmesser_topics: Dict[str, config.MqttTopic] = settings.mqtt_topics.root.get("wasserstandsmesser", {})
-    logger.debug(Helper.get_pretty_dict_json_no_sort(wasserstandsmesser_topics))
+    logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(wasserstandsmesser_topics))
 
     assert "wasserstand" in wasserstandsmesser_topics
-    topic = wasserstandsmesser_topics["wasserstand"].topic
-
-    wasserstand, wasserstand_created_at = _get_latest_from_mqtt(
-        topic=topic, value_fieldname="unteroberkante", created_at_fieldname="orig_time", noisy=noisy
-    )
-
     assert "ma" in wasserstandsmesser_topics
-    topic = wasserstandsmesser_topics["ma"].topic
-
-    ma, ma_created_at = _get_latest_from_mqtt(
-        topic=topic, value_fieldname="value", created_at_fieldname="created_at", noisy=noisy
-    )
-
     assert "busvoltage" in wasserstandsmesser_topics
-    topic = wasserstandsmesser_topics["busvoltage"].topic
 
-    busvoltage, busvoltage_created_at = _get_latest_from_mqtt(
-        topic=topic, value_fieldname="value", created_at_fieldname="created_at", noisy=noisy
+    wasserstand_topic: str = wasserstandsmesser_topics["wasserstand"].topic
+    ma_topic: str = wasserstandsmesser_topics["ma"].topic
+    busvoltage_topic: str = wasserstandsmesser_topics["busvoltage"].topic
+
+    # one connect+subscribe for all three topics
+    payloads: Dict[str, Dict[str, float | str]] = _get_latest_payloads_from_mqtt(
+        [wasserstand_topic, ma_topic, busvoltage_topic], noisy=noisy
     )
 
-    return (wasserstand, wasserstand_created_at), (busvoltage, busvoltage_created_at), (ma, ma_created_at)
+    wasserstand: Tuple[float | None, datetime.datetime | None] = _parse_mqtt_payload(
+        wasserstand_topic,
+        payloads[wasserstand_topic],
+        value_fieldname="unteroberkante",
+        created_at_fieldname="orig_time",
+    )
+    ma: Tuple[float | None, datetime.datetime | None] = _parse_mqtt_payload(
+        ma_topic, payloads[ma_topic], value_fieldname="value", created_at_fieldname="created_at"
+    )
+    busvoltage: Tuple[float | None, datetime.datetime | None] = _parse_mqtt_payload(
+        busvoltage_topic, payloads[busvoltage_topic], value_fieldname="value", created_at_fieldname="created_at"
+    )
 
+    return wasserstand, busvoltage, ma
 
-def read_netatmo() -> dict:
-    # import needed since module import has side effects -> creates ~/.netatmo.credentials
-    import netatmostuff.lnetatmo as lnetatmo
-    from netatmostuff.Crontanamo import ensure_up2date_netatmo_credentialsfile
 
+# auth (token refresh) + /getstationsdata roundtrip are reused for 5min - the access token itself is valid for hours
+@cached(cache=TTLCache(maxsize=1, ttl=300))
+def _weather_data() -> lnetatmo.WeatherStationData:
     # Example: USERNAME and PASSWORD supposed to be defined by one of the previous methods
-    ret: dict = {}
-
     auth_data = lnetatmo.ClientAuth()
     # auth_data = lnetatmo.ClientAuth(
     #     clientId=os.environ.get("NETATMO_CLIENT_ID"),
@@ -200,7 +235,33 @@ def read_netatmo() -> dict:
     #     refreshToken=os.environ.get("NETATMO_REFRESH_TOKEN")
     # )
 
-    weather_data: lnetatmo.WeatherStationData = lnetatmo.WeatherStationData(auth_data)
+    return lnetatmo.WeatherStationData(auth_data)
+
+
+def _measure_window(now: datetime.datetime) -> Tuple[datetime.datetime, datetime.datetime, float]:
+    """Time window of the hourly rain measures for ``now`` (tz-aware).
+
+    Returns ``(begin, end, today_start_ts)``: yesterday 00:00, the last microsecond of the previous full hour and the
+    timestamp of today's local midnight -> measures at/after ``today_start_ts`` are "today", the rest "yesterday".
+    """
+    today0: datetime.datetime = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # timedelta instead of replace(day=day - 1) -> no ValueError on the 1st; local midnight always exists
+    begin: datetime.datetime = today0 - datetime.timedelta(days=1)
+
+    # end of the previous hour in absolute time -> wall-clock "hour - 1" could land in the DST gap (02:xx on switch day)
+    hour0: datetime.datetime = now.replace(minute=0, second=0, microsecond=0)
+    end: datetime.datetime = (hour0.astimezone(datetime.timezone.utc) - datetime.timedelta(microseconds=1)).astimezone(
+        now.tzinfo
+    )
+
+    return begin, end, today0.timestamp()
+
+
+def read_netatmo() -> dict:
+    ret: dict = {}
+
+    weather_data: lnetatmo.WeatherStationData = _weather_data()
     logger.debug(f"{type(weather_data.default_station_data)=} {weather_data.default_station_data=}")
     logger.debug(f"{weather_data.homes=}")
     logger.debug(f"{weather_data.modulesNamesList()=}")
@@ -212,7 +273,7 @@ def read_netatmo() -> dict:
         mod: dict = weather_data.moduleByName(n)
         logger.debug(f"{n} => {type(mod)=} {mod=}")
 
-        logger.debug(Helper.get_pretty_dict_json_no_sort(mod))
+        logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(mod))
 
         if n == settings.netatmo.outdoormodule.name or (
             mod is not None and mod["_id"] == str(settings.netatmo.outdoormodule.id)
@@ -233,17 +294,13 @@ def read_netatmo() -> dict:
     ret["current_temp"] = current_temp
     ret["rain_lasthour"] = lasthourrain
 
-    begin: datetime.datetime = datetime.datetime.now(TIMEZONE)
-    begin = begin.replace(day=begin.day - 1, hour=0, minute=0, second=0, microsecond=0)
+    begin: datetime.datetime
+    end: datetime.datetime
+    today_start_ts: float
+    begin, end, today_start_ts = _measure_window(datetime.datetime.now(TIMEZONE))
     logger.debug(f" {begin=} {begin}")
-
-    end: datetime.datetime = datetime.datetime.now(TIMEZONE)
-    end = end.replace(hour=end.hour - 1, minute=59, second=59, microsecond=999_999)
     logger.debug(f" {end=} {end}")
 
-    now: datetime.datetime = datetime.datetime.now(TIMEZONE)
-    now_sdf_d: str = now.strftime(_sdfD_formatstring)
-
     measures: dict = weather_data.getMeasure(
         device_id=weather_data.default_station_data["_id"],  # "70:ee:50:02:ed:4c",  # "Indoor" | homestationid!
         scale="1hour",  # Timeframe between two measurements {30min, 1hour, 3hours, 1day, 1week, 1month}
@@ -271,28 +328,31 @@ def read_netatmo() -> dict:
     if len(bms) == 0:
         raise Exception("NO DATA RETURNED")
 
-    for times in bms:
-        measures_here: list[float | int] = bms[times]
-        measures_here_0: float = measures_here[0]
-
-        measure_date: datetime.datetime = datetime.datetime.fromtimestamp(float(times), TIMEZONE)
-        # logger.debug(f"timestamp: {times}\tmeasure_date: {measure_date}\tmeasures_here: {measures_here}")
+    # indexed by "is today" -> (target list, key of the rain sum in ret)
+    buckets: Tuple[Tuple[list[dict], str], Tuple[list[dict], str]] = (
+        (ret_measures_yesterday, "rain_overall_yesterday"),
+        (ret_measures_today, "rain_overall_today"),
+    )
 
-        measure_sdf_d: str = measure_date.strftime(_sdfD_formatstring)
+    measures_here: list[float | int]
+    for times, measures_here in bms.items():
+        measures_here_0: float = measures_here[0]
 
-        tgt: list[dict] = ret_measures_yesterday
+        measure_ts: float = float(times)
+        # logger.debug(f"timestamp: {times}\tmeasures_here: {measures_here}")
 
-        if now_sdf_d == measure_sdf_d:
-            tgt = ret_measures_today
-            ret["rain_overall_today"] += measures_here_0
-        else:
-            ret["rain_overall_yesterday"] += measures_here_0
+        tgt: list[dict]
+        rainkey: str
+        tgt, rainkey = buckets[measure_ts >= today_start_ts]
+        ret[rainkey] += measures_here_0
 
+        # only needed for the formatted output fields
+        measure_date: datetime.datetime = datetime.datetime.fromtimestamp(measure_ts, TIMEZONE)
         tgt.append(
             {
-                "date": measure_sdf_d,
-                "datetime": measure_date.strftime(_sdfDHM_formatstring),
-                "time_millis": measure_date.timestamp(),  # begin auf die stunde ?!
+                "date": _sdf_d(measure_date),
+                "datetime": _sdf_dhm(measure_date),
+                "time_millis": measure_ts,  # begin auf die stunde ?!
                 "rain": measures_here_0,
             }
         )
@@ -329,9 +389,6 @@ def do_main_stuff() -> None:
         logger.opt(exception=ex).exception(ex)
     finally:
         try:
-            import netatmostuff.lnetatmo as lnetatmo
-            from netatmostuff.Crontanamo import write_netatmo_credentials_to_shared_file
-
             write_netatmo_credentials_to_shared_file()
         except Exception as ex:
             logger.opt(exception=ex).exception(ex)
@@ -8,6 +8,7 @@ and --yes for non-interactive (Ansible) usage.
 """
 
 import argparse
+import json
 import subprocess
 import sys
 from pathlib import Path
@@ -15,13 +16,38 @@ from urllib.parse import urlparse
 
 import yaml
 
+# libyaml-backed loader/dumper if PyYAML was built with it
+_YamlSafeLoader: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlSafeDumper: type[yaml.SafeDumper] = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def parse_kubeconfig(raw: bytes | str) -> dict:
+    """Parse kubeconfig content.
+
+    JSON is a YAML subset and kubeconfigs are sometimes written as JSON, so
+    content starting with '{' is tried with the (much faster) json parser
+    first. Everything else goes through yaml's (C)SafeLoader.
+    """
+    if raw.lstrip()[:1] in (b"{", "{"):
+        try:
+            return json.loads(raw) or {}
+        except json.JSONDecodeError:
+            pass
+    return yaml.load(raw, Loader=_YamlSafeLoader) or {}
+
+
+def write_kubeconfig(path: Path, kubeconfig: dict) -> None:
+    """Write kubeconfig as block-style YAML, emitted by libyaml directly into the file."""
+    with open(path, "w") as f:
+        yaml.dump(kubeconfig, f, Dumper=_YamlSafeDumper, default_flow_style=False)
+
 
 def get_remote_kubeconfig(host: str, remote_path: str) -> dict:
     """Fetch kubeconfig from remote host via SSH."""
     cmd = ["ssh", host, f"cat {remote_path}"]
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return yaml.safe_load(result.stdout)
+        return parse_kubeconfig(result.stdout)
     except subprocess.CalledProcessError as e:
         print(f"Error accessing {host} via SSH: {e.stderr}")
         sys.exit(1)
@@ -39,8 +65,7 @@ def load_local_kubeconfig(path: Path, allow_missing: bool = False) -> dict:
             return {}
         print(f"Local kubeconfig not found: {path}")
         sys.exit(1)
-    with open(path) as f:
-        return yaml.safe_load(f) or {}
+    return parse_kubeconfig(path.read_bytes())
 
 
 def find_context_user(kubeconfig: dict, context_name: str) -> str | None:
@@ -75,33 +100,21 @@ def get_cluster_ca(kubeconfig: dict, cluster_name: str) -> str | None:
     return None
 
 
-def compare_credentials(remote: dict, local: dict, remote_ca: str | None, local_ca: str | None) -> dict:
-    """Compare remote and local credentials, return differences."""
-    differences = {}
-
-    remote_cert = remote.get("client-certificate-data")
-    local_cert = local.get("client-certificate-data")
-    if remote_cert != local_cert:
-        differences["client-certificate-data"] = {
-            "remote": remote_cert[:50] + "..." if remote_cert else None,
-            "local": local_cert[:50] + "..." if local_cert else None,
-        }
+def _preview(value: str | None) -> str | None:
+    """Shortened representation of a (base64) blob for display."""
+    return value[:50] + "..." if value else None
 
-    remote_key = remote.get("client-key-data")
-    local_key = local.get("client-key-data")
-    if remote_key != local_key:
-        differences["client-key-data"] = {
-            "remote": remote_key[:50] + "..." if remote_key else None,
-            "local": local_key[:50] + "..." if local_key else None,
-        }
 
-    if remote_ca != local_ca:
-        differences["certificate-authority-data"] = {
-            "remote": remote_ca[:50] + "..." if remote_ca else None,
-            "local": local_ca[:50] + "..." if local_ca else None,
-        }
+def compare_credentials(remote: dict, local: dict, remote_ca: str | None, local_ca: str | None) -> dict:
+    """Compare remote and local credentials, return differences."""
+    checks: tuple[tuple[str, str | None, str | None], ...] = (
+        ("client-certificate-data", remote.get("client-certificate-data"), local.get("client-certificate-data")),
+        ("client-key-data", remote.get("client-key-data"), local.get("client-key-data")),
+        ("certificate-authority-data", remote_ca, local_ca),
+    )
 
-    return differences
+    # previews are only built for mismatching entries
+    return {name: {"remote": _preview(r), "local": _preview(l)} for name, r, l in checks if r != l}
 
 
 def update_local_kubeconfig(
@@ -127,8 +140,7 @@ def update_local_kubeconfig(
             break
 
     # Write back
-    with open(local_path, "w") as f:
-        yaml.dump(kubeconfig, f, default_flow_style=False)
+    write_kubeconfig(local_path, kubeconfig)
 
     print(f"Local kubeconfig updated: {local_path}")
 
@@ -196,8 +208,7 @@ def create_context(
         kubeconfig["current-context"] = context_name
 
     # Write back
-    with open(local_path, "w") as f:
-        yaml.dump(kubeconfig, f, default_flow_style=False)
+    write_kubeconfig(local_path, kubeconfig)
 
     print(f"Created context '{context_name}' (cluster={cluster_name}, user={user_name}) in {local_path}")
 
@@ -224,8 +235,7 @@ def get_defaults_from_kubeconfig() -> tuple[str | None, str | None]:
         return None, None
 
     try:
-        with open(local_path) as f:
-            config = yaml.safe_load(f)
+        config = parse_kubeconfig(local_path.read_bytes())
     except Exception:
         return None, None
 
@@ -1,157 +1,133 @@
-import time
-
 from google import genai
-from google.genai.types import CreateBatchJobConfig
+from google.genai.types import BatchJob, CreateBatchJobConfig
 from pydantic import BaseModel, TypeAdapter
 
+from llmstuff.llmhelper import wait_for_batch_job
+
 
 class Recipe(BaseModel):
     recipe_name: str
     ingredients: list[str]
 
 
-client = genai.Client()
-
-jc: CreateBatchJobConfig
-
-
-# A list of dictionaries, where each is a GenerateContentRequest
-inline_requests = [
-    {
-        "contents": [
-            {
-                "parts": [{"text": "List a few popular cookie recipes, and include the amounts of ingredients."}],
-                "role": "user",
-            }
-        ],
-        "config": {"response_mime_type": "application/json", "response_schema": list[Recipe]},
-    },
-    {
-        "contents": [
-            {
-                "parts": [
-                    {"text": "List a few popular gluten free cookie recipes, and include the amounts of ingredients."}
-                ],
-                "role": "user",
-            }
-        ],
-        "config": {"response_mime_type": "application/json", "response_schema": list[Recipe]},
-    },
-]
-
-# TODO HT20251126 proper implement typed
-inline_batch_job = client.batches.create(
-    model="models/gemini-2.5-flash",
-    src=inline_requests,  # type: ignore
-    config={"display_name": "structured-output-job-1"},
-)
-
-# wait for the job to finish
-job_name = inline_batch_job.name
-print(f"Polling status for job: {job_name}")
-
-# TODO HT20251126 proper implement typed
-while True:
-    batch_job_inline = client.batches.get(name=job_name)  # type: ignore
-    if batch_job_inline.state.name in (  # type: ignore
-        "JOB_STATE_SUCCEEDED",
-        "JOB_STATE_FAILED",
-        "JOB_STATE_CANCELLED",
-        "JOB_STATE_EXPIRED",
-    ):
-        break
-    print(f"Job not finished. Current state: {batch_job_inline.state.name}. Waiting 30 seconds...")  # type: ignore
-    time.sleep(30)
-
-print(f"Job finished with state: {batch_job_inline.state.name}")  # type: ignore
-
-
-# TODO HT20251126 proper implement typed
-# print the response
-for i, inline_response in enumerate(batch_job_inline.dest.inlined_responses, start=1):  # type: ignore
-    print(f"\n--- Response {i} ---")
-
-    # Check for a successful response
-    if inline_response.response:
-        # The .text property is a shortcut to the generated text.
-        print(inline_response.response.text)
-
-
-import time
+# built once -> validator-construction is not repeated per response
+_RECIPE_LIST_ADAPTER: TypeAdapter[list[Recipe]] = TypeAdapter(list[Recipe])
+
+
+def _example_inline_batch(client: genai.Client) -> BatchJob:
+    # A list of dictionaries, where each is a GenerateContentRequest
+    inline_requests = [
+        {
+            "contents": [
+                {
+                    "parts": [{"text": "List a few popular cookie recipes, and include the amounts of ingredients."}],
+                    "role": "user",
+                }
+            ],
+            "config": {"response_mime_type": "application/json", "response_schema": list[Recipe]},
+        },
+        {
+            "contents": [
+                {
+                    "parts": [
+                        {
+                            "text": "List a few popular gluten free cookie recipes, and include the amounts of ingredients."
+                        }
+                    ],
+                    "role": "user",
+                }
+            ],
+            "config": {"response_mime_type": "application/json", "response_schema": list[Recipe]},
+        },
+    ]
 
-from google import genai
+    # TODO HT20251126 proper implement typed
+    inline_batch_job = client.batches.create(
+        model="models/gemini-2.5-flash",
+        src=inline_requests,  # type: ignore
+        config=CreateBatchJobConfig(display_name="structured-output-job-1"),
+    )
 
-client = genai.Client()
+    # wait for the job to finish
+    job_name = inline_batch_job.name
+    print(f"Polling status for job: {job_name}")
 
-# Use the name of the job you want to check
-# e.g., inline_batch_job.name from the previous step
-job_name = "YOUR_BATCH_JOB_NAME"  # (e.g. 'batches/your-batch-id')
-batch_job = client.batches.get(name=job_name)
+    # TODO HT20251126 proper implement typed
+    batch_job_inline = wait_for_batch_job(client, job_name)  # type: ignore
 
-completed_states = set(
-    [
-        "JOB_STATE_SUCCEEDED",
-        "JOB_STATE_FAILED",
-        "JOB_STATE_CANCELLED",
-        "JOB_STATE_EXPIRED",
-    ]
-)
-
-# TODO HT20251126 proper implement typed
-print(f"Polling status for job: {job_name}")
-batch_job = client.batches.get(name=job_name)  # Initial get
-while batch_job.state.name not in completed_states:  # type: ignore
-    print(f"Current state: {batch_job.state.name}")  # type: ignore
-    time.sleep(30)  # Wait for 30 seconds before polling again
-    batch_job = client.batches.get(name=job_name)
+    print(f"Job finished with state: {batch_job_inline.state.name}")  # type: ignore
 
-print(f"Job finished with state: {batch_job.state.name}")  # type: ignore
-if batch_job.state.name == "JOB_STATE_FAILED":  # type: ignore
-    print(f"Error: {batch_job.error}")
+    # TODO HT20251126 proper implement typed
+    # print the response
+    for i, inline_response in enumerate(batch_job_inline.dest.inlined_responses, start=1):  # type: ignore
+        print(f"\n--- Response {i} ---")
 
+        # Check for a successful response
+        if inline_response.response and inline_response.response.text:
+            # The .text property is a shortcut to the generated text.
+            for recipe in _RECIPE_LIST_ADAPTER.validate_json(inline_response.response.text):
+                print(recipe.model_dump_json())
 
-import json
+    return batch_job_inline
 
-from google import genai
 
-client = genai.Client()
-
-# Use the name of the job you want to check
-# e.g., inline_batch_job.name from the previous step
-job_name = "YOUR_BATCH_JOB_NAME"
-batch_job = client.batches.get(name=job_name)
-
-if batch_job.state.name == "JOB_STATE_SUCCEEDED":  # type: ignore
-
-    # If batch job was created with a file
-    if batch_job.dest and batch_job.dest.file_name:
-        # Results are in a file
-        result_file_name = batch_job.dest.file_name
-        print(f"Results are in file: {result_file_name}")
-
-        print("Downloading result file content...")
-        file_content = client.files.download(file=result_file_name)
-        # Process file_content (bytes) as needed
-        print(file_content.decode("utf-8"))
-
-    # If batch job was created with inline request
-    # (for embeddings, use batch_job.dest.inlined_embed_content_responses)
-    elif batch_job.dest and batch_job.dest.inlined_responses:
-        # Results are inline
-        print("Results are inline:")
-        for i, inline_response in enumerate(batch_job.dest.inlined_responses):
-            print(f"Response {i+1}:")
-            if inline_response.response:
-                # Accessing response, structure may vary.
-                try:
-                    print(inline_response.response.text)
-                except AttributeError:
-                    print(inline_response.response)  # Fallback
-            elif inline_response.error:
-                print(f"Error: {inline_response.error}")
-    else:
-        print("No results found (neither file nor inline).")
-else:
-    print(f"Job did not succeed. Final state: {batch_job.state.name}")  # type: ignore
-    if batch_job.error:
+def _example_poll_status(client: genai.Client, job_name: str) -> None:
+    # TODO HT20251126 proper implement typed
+    print(f"Polling status for job: {job_name}")
+    batch_job = wait_for_batch_job(client, job_name)
+
+    print(f"Job finished with state: {batch_job.state.name}")  # type: ignore
+    if batch_job.state.name == "JOB_STATE_FAILED":  # type: ignore
         print(f"Error: {batch_job.error}")
+
+
+def _example_fetch_results(client: genai.Client, job_name: str) -> None:
+    batch_job = client.batches.get(name=job_name)
+
+    if batch_job.state.name == "JOB_STATE_SUCCEEDED":  # type: ignore
+
+        # If batch job was created with a file
+        if batch_job.dest and batch_job.dest.file_name:
+            # Results are in a file
+            result_file_name = batch_job.dest.file_name
+            print(f"Results are in file: {result_file_name}")
+
+            print("Downloading result file content...")
+            file_content = client.files.download(file=result_file_name)
+            # Process file_content (bytes) as needed
+            print(file_content.decode("utf-8"))
+
+        # If batch job was created with inline request
+        # (for embeddings, use batch_job.dest.inlined_embed_content_responses)
+        elif batch_job.dest and batch_job.dest.inlined_responses:
+            # Results are inline
+            print("Results are inline:")
+            for i, inline_response in enumerate(batch_job.dest.inlined_responses):
+                print(f"Response {i+1}:")
+                if inline_response.response:
+                    # Accessing response, structure may vary.
+                    try:
+                        print(inline_response.response.text)
+                    except AttributeError:
+                        print(inline_response.response)  # Fallback
+                elif inline_response.error:
+                    print(f"Error: {inline_response.error}")
+        else:
+            print("No results found (neither file nor inline).")
+    else:
+        print(f"Job did not succeed. Final state: {batch_job.state.name}")  # type: ignore
+        if batch_job.error:
+            print(f"Error: {batch_job.error}")
+
+
+if __name__ == "__main__":
+    client = genai.Client()
+
+    batch_job_inline: BatchJob = _example_inline_batch(client)
+
+    # Use the name of the job you want to check
+    # e.g., inline_batch_job.name from the previous step (e.g. 'batches/your-batch-id')
+    job_name: str = batch_job_inline.name  # type: ignore
+
+    _example_poll_status(client, job_name)
+    _example_fetch_results(client, job_name)
@@ -1,23 +1,32 @@
+from __future__ import annotations
+
 import datetime
+import functools
 import json
 import mimetypes
+import os
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import StrEnum
-from io import StringIO
 from pathlib import Path
-from typing import List, Literal, Optional, Tuple, Type, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional, Tuple, Type, TypeVar
 
-import google.genai
-from google.genai.client import DebugConfig
-from google.genai.types import GenerateContentResponse
+from cachetools import TTLCache, cached
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from config import settings
 from Helper import get_pretty_dict_json_no_sort
 
-mimetypes.init()
+if TYPE_CHECKING:
+    # google.genai (and httpx underneath) pulls in hundreds of modules -> imported lazily where actually used
+    import google.genai
+    import httpx
+    from google.genai.client import DebugConfig
+    from google.genai.types import GenerateContentResponse
 
 # try:
 #     from openai.types.chat import ChatCompletionDeveloperMessageParam, ChatCompletionSystemMessageParam, \
@@ -65,7 +74,7 @@ class AnthropicLLMModel(StrEnum):
 #     )
 
 
-@dataclass
+@dataclass(slots=True)
 class AIRequest[T]:
     prompt: str
     system_prompt: str | None = None
@@ -75,6 +84,8 @@ class AIRequest[T]:
     enable_websearch: bool = False
     history: Optional[List[google.genai.types.Content]] = None
     image: Optional[Path] = None
+    # None -> "off" for plain structured-output requests (response_schema without websearch), "auto" otherwise
+    thinking: Optional[Literal["off", "auto", "high"]] = None
     # use_pydantic_ai_with_anthropic_response_schema: bool = _USE_PYDANTIC_AI_FOR_ANTHROPIC_RESPONSE_SCHEMA
 
     # dbrecorder: Optional["AIRequestDBRecorder"] = None
@@ -108,66 +119,225 @@ class AIRequest[T]:
 #         return aireqresp
 
 
-def request_gemini[T](
-    airequest: AIRequest[T], debug_with_replayid: str | None = None, retries: int | None = 10
-) -> Tuple[str | T | List[T], Optional[str], google.genai.types.GenerateContentResponse]:
+@functools.lru_cache(maxsize=1)
+def _get_httpx_client() -> httpx.Client:
+    import httpx
 
-    debugconfig: DebugConfig | None = None
-    if debug_with_replayid:
-        debugconfig = google.genai.client.DebugConfig(
-            client_mode="record",
-            replay_id=f"MODULE/FUNCTION/{datetime.datetime.now():%Y%m%d-%H%M%S.%s}",
-            replays_directory=str(Path(Path(Path.home(), "Desktop"), "GOOGLE_REPLAYDIR")),
-        )
+    # one connection-pool shared by all genai-clients -> TLS-sessions survive across calls (and clients)
+    # timeout=None -> the sdk passes the (http_options-)timeout per request
+    return httpx.Client(limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60), timeout=None)
+
+
+def _build_gemini_http_options(retries: int | None) -> google.genai.types.HttpOptions:
+    import google.genai
 
     # https://googleapis.github.io/python-genai/genai.html#genai.types.HttpRetryOptions
     # https://github.com/googleapis/python-genai/issues/336
-    http_options: google.genai.types.HttpOptions | None = None
+    retry_options: google.genai.types.HttpRetryOptions | None = None
     if retries is not None and retries > 1:
-        http_options = google.genai.types.HttpOptions(
-            retry_options=google.genai.types.HttpRetryOptions(
-                initial_delay=5, attempts=retries, exp_base=2.0, max_delay=120.0, http_status_codes=[429, 502, 503, 504]
-            )
+        retry_options = google.genai.types.HttpRetryOptions(
+            initial_delay=5, attempts=retries, exp_base=2.0, max_delay=120.0, http_status_codes=[429, 502, 503, 504]
         )
+    return google.genai.types.HttpOptions(retry_options=retry_options, httpx_client=_get_httpx_client())
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(retries: int | None = 10) -> google.genai.Client:
+    import google.genai
+
+    # one client per retry-setting -> auth and http-connection-pool are reused across calls (client is thread-safe)
+    return google.genai.Client(http_options=_build_gemini_http_options(retries), api_key=settings.google.gemini_api_key)
+
+
+def _create_gemini_client(debug_with_replayid: str | None = None, retries: int | None = 10) -> google.genai.Client:
+    if not debug_with_replayid:
+        return _get_client(retries)
+
+    import google.genai
 
-    client = google.genai.Client(
-        http_options=http_options, api_key=settings.google.gemini_api_key, debug_config=debugconfig
+    # debug/replay-clients record into a fresh replay_id each -> not cached
+    debugconfig: DebugConfig = google.genai.client.DebugConfig(
+        client_mode="record",
+        replay_id=f"MODULE/FUNCTION/{datetime.datetime.now():%Y%m%d-%H%M%S.%s}",
+        replays_directory=str(Path(Path(Path.home(), "Desktop"), "GOOGLE_REPLAYDIR")),
     )
 
-    grounding_tool: google.genai.types.Tool = google.genai.types.Tool(google_search=google.genai.types.GoogleSearch())
+    return google.genai.Client(
+        http_options=_build_gemini_http_options(retries),
+        api_key=settings.google.gemini_api_key,
+        debug_config=debugconfig,
+    )
+
+
+# request-independent -> built once (on first use) and shared by all requests (never mutated afterwards)
+@functools.lru_cache(maxsize=1)
+def _grounding_tool() -> google.genai.types.Tool:
+    import google.genai
+
+    return google.genai.types.Tool(google_search=google.genai.types.GoogleSearch())
+
+
+@functools.lru_cache(maxsize=16)
+def _thinking_config(
+    model: GoogleLLMModel, thinking: Literal["off", "auto", "high"]
+) -> google.genai.types.ThinkingConfig:
+    import google.genai
+
+    if model == GoogleLLMModel.GEMINI_30_PRO_PREVIEW:
+        # google.genai.errors.ClientError: 400 INVALID_ARGUMENT.
+        # {'error': {'code': 400, 'message': 'You can only set only one of thinking budget and thinking level.', 'status': 'INVALID_ARGUMENT'}}
+        # gemini-3 cannot turn off thinking -> "off" is the LOW level without returned thoughts
+        return google.genai.types.ThinkingConfig(
+            thinking_level=(
+                google.genai.types.ThinkingLevel.LOW if thinking == "off" else google.genai.types.ThinkingLevel.HIGH
+            ),  # LOW | THINKING_LEVEL_UNSPECIFIED
+            include_thoughts=thinking != "off",
+        )
+
+    if thinking == "off":
+        # gemini-2.5-pro cannot turn off thinking -> minimum budget there
+        return google.genai.types.ThinkingConfig(
+            thinking_budget=128 if model == GoogleLLMModel.GEMINI_25_PRO else 0, include_thoughts=False
+        )
+
+    if thinking == "high":
+        return google.genai.types.ThinkingConfig(
+            thinking_budget=32768 if model == GoogleLLMModel.GEMINI_25_PRO else 24576, include_thoughts=True
+        )
 
-    thinking_config: google.genai.types.ThinkingConfig = google.genai.types.ThinkingConfig(
+    return google.genai.types.ThinkingConfig(
         thinking_budget=-1, include_thoughts=True  # 8192,
     )  # turn-off thinking: budget=0, dynamic thinking: budget=-1
 
-    # google.genai.errors.ClientError: 400 INVALID_ARGUMENT.
-    # {'error': {'code': 400, 'message': 'You can only set only one of thinking budget and thinking level.', 'status': 'INVALID_ARGUMENT'}}
 
-    if airequest.model == GoogleLLMModel.GEMINI_30_PRO_PREVIEW:
-        thinking_config.thinking_level = google.genai.types.ThinkingLevel.HIGH  # LOW | THINKING_LEVEL_UNSPECIFIED
-        thinking_config.thinking_budget = None
+def _resolve_thinking[T](airequest: AIRequest[T]) -> Literal["off", "auto", "high"]:
+    if airequest.thinking is not None:
+        return airequest.thinking
+    # plain extraction into a schema does not benefit from (billed, slow) thinking-tokens
+    return "off" if airequest.response_schema and not airequest.enable_websearch else "auto"
 
-    genconf: google.genai.types.GenerateContentConfig = google.genai.types.GenerateContentConfig(
+
+@functools.lru_cache(maxsize=64)
+def _response_schema_adapter(response_schema: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(response_schema)
+
+
+@functools.lru_cache(maxsize=64)
+def _response_json_schema(response_schema: Any) -> Dict[str, Any]:
+    return _response_schema_adapter(response_schema).json_schema()
+
+
+def _build_gemini_config[T](airequest: AIRequest[T]) -> google.genai.types.GenerateContentConfig:
+    import google.genai
+
+    # list[Recipe] -> precomputed (cached) json-schema instead of letting the sdk re-derive it on every call
+    json_schema: Dict[str, Any] | None = None
+    if airequest.response_schema:
+        json_schema = _response_json_schema(airequest.response_schema)  # type: ignore  # TODO HT20251126 make it properly typed
+
+    return google.genai.types.GenerateContentConfig(
         # system_instruction="You are a cat. Your name is Neko.",
-        tools=[grounding_tool] if airequest.enable_websearch else None,
-        thinking_config=thinking_config,
+        tools=[_grounding_tool()] if airequest.enable_websearch else None,
+        thinking_config=_thinking_config(airequest.model, _resolve_thinking(airequest)),
         response_mime_type="application/json" if airequest.response_schema else None,
         system_instruction=airequest.system_prompt,
-        response_schema=airequest.response_schema,  # list[Recipe]
+        response_json_schema=json_schema,
     )
 
-    contents: List[google.genai.types.Content] = []
-    if airequest.history:
-        contents.extend(airequest.history)
+
+@functools.lru_cache(maxsize=128)
+def _mime_for_suffix(suffix: str) -> str | None:
+    if not mimetypes.inited:
+        mimetypes.init()
+    return mimetypes.types_map.get(suffix) or mimetypes.guess_type(f"x{suffix}")[0]
+
+
+# images larger than this go through the File API instead of being inlined (base64) into every request
+INLINE_IMAGE_MAX_BYTES: int = 1024 * 1024
+
+
+# uploaded files are kept by google for 48h -> cache a bit shorter than that
+# mtime_ns and size are part of the cache-key -> a changed file gets uploaded again
+@cached(cache=TTLCache(maxsize=64, ttl=47 * 3600), lock=threading.Lock())
+def _upload_file(path: str, mtime_ns: int, size: int, mime_type: str) -> str:
+    uploaded: google.genai.types.File = _get_client().files.upload(file=path, config={"mime_type": mime_type})
+    logger.debug(f"Uploaded {path=} {size=} -> {uploaded.uri=}")
+    assert uploaded.uri is not None
+    return uploaded.uri
+
+
+def _build_gemini_contents[T](airequest: AIRequest[T]) -> List[google.genai.types.Content]:
+    import google.genai
 
     parts: List[google.genai.types.Part] = [google.genai.types.Part(text=airequest.prompt)]
 
     if airequest.image is not None:
-        mt: str | None = mimetypes.guess_file_type(airequest.image)[0]
-        assert mt is not None
-        parts.append(google.genai.types.Part.from_bytes(data=airequest.image.read_bytes(), mime_type=mt))
+        mt: str | None = _mime_for_suffix(airequest.image.suffix.lower())
+        if mt is None:
+            raise ValueError(f"Could not determine mime-type of {airequest.image=}")
+        # stat and read on the same fd -> exactly one sized read of the size the inline/upload decision was made on
+        with airequest.image.open("rb") as f:
+            st: os.stat_result = os.fstat(f.fileno())
+            if st.st_size > INLINE_IMAGE_MAX_BYTES:
+                parts.append(
+                    google.genai.types.Part.from_uri(
+                        file_uri=_upload_file(str(airequest.image), st.st_mtime_ns, st.st_size, mt), mime_type=mt
+                    )
+                )
+            else:
+                parts.append(google.genai.types.Part.from_bytes(data=f.read(st.st_size), mime_type=mt))
+
+    user_content: google.genai.types.Content = google.genai.types.UserContent(parts=parts)
+
+    return [*airequest.history, user_content] if airequest.history else [user_content]
+
+
+def _first_content(response: GenerateContentResponse) -> Optional[google.genai.types.Content]:
+    """Returns the content of the first candidate (``None`` if there is none)."""
+    return response.candidates[0].content if response.candidates else None
 
-    contents.append(google.genai.types.UserContent(parts=parts))
+
+def _first_parts(response: GenerateContentResponse) -> List[google.genai.types.Part]:
+    """Returns the parts of the first candidate (empty if there are none)."""
+    content: Optional[google.genai.types.Content] = _first_content(response)
+    return (content.parts or []) if content is not None else []
+
+
+def _split_thoughts_and_answer(
+    response: GenerateContentResponse, collect_answer: bool = True
+) -> Tuple[Optional[str], Optional[str]]:
+    """Returns ``(answer, thoughts)`` collected from the text-parts of the first candidate.
+
+    With ``collect_answer=False`` only the thoughts are collected (answer is ``None``) -> used when the answer is
+    already available as parsed object.
+    """
+    thought_parts: List[str] = []
+    answer_parts: List[str] = []
+
+    for part in _first_parts(response):
+        if not part.text:
+            continue
+
+        # logger.debug("Thought summary:" if part.thought else "Answer:")
+        # logger.debug(part.text)
+        if part.thought:
+            thought_parts.append(part.text.strip())
+        elif collect_answer:
+            answer_parts.append(part.text.strip())
+
+    answer: Optional[str] = "\n".join(answer_parts).strip() or None
+    thoughts: Optional[str] = "\n".join(thought_parts).strip() or None
+
+    return answer, thoughts
+
+
+def request_gemini[T](
+    airequest: AIRequest[T], debug_with_replayid: str | None = None, retries: int | None = 10
+) -> Tuple[str | T | List[T], Optional[str], google.genai.types.GenerateContentResponse]:
+    client: google.genai.Client = _create_gemini_client(debug_with_replayid=debug_with_replayid, retries=retries)
+
+    genconf: google.genai.types.GenerateContentConfig = _build_gemini_config(airequest)
+    contents: List[google.genai.types.Content] = _build_gemini_contents(airequest)
 
     logger.debug(f"{airequest.model=}")
 
@@ -183,7 +353,13 @@ def request_gemini[T](
     mystuff: Optional[T | Type[List[T]]] = None
     # Use instantiated objects.
     if airequest.response_schema:
-        mystuff = response.parsed  # type: ignore  # TODO HT20251126 make it properly typed
+        # with response_json_schema the sdk only json.loads the answer -> validate into the schema-type here
+        if response.parsed is not None:
+            try:
+                mystuff = _response_schema_adapter(airequest.response_schema).validate_python(response.parsed)  # type: ignore  # TODO HT20251126 make it properly typed
+            except ValidationError as e:
+                # same as the sdk did with response_schema= -> no parsed object, the answer-text is returned instead
+                logger.opt(exception=e).warning("answer does not match the response_schema -> returning the text")
         # logger.debug(f"{type(mystuff)=} {mystuff=}")
         #
         # if isinstance(mystuff, list):
@@ -192,46 +368,120 @@ def request_gemini[T](
         # else:
         #     logger.debug(mystuff.model_dump_json())
 
-    answer: Optional[str] = None
-    thoughts: Optional[str] = None
+    # answer-text is only needed if there is no parsed object to return
+    answer, thoughts = _split_thoughts_and_answer(response, collect_answer=not mystuff)
 
-    thought_writer: StringIO = StringIO()
-    answer_writer: StringIO = StringIO()
+    if mystuff:
+        return mystuff, thoughts, response  # type: ignore  # TODO HT20251126 make it properly typed
+
+    return answer, thoughts, response  # type: ignore  # TODO HT20251126 make it properly typed
+
+
+BATCH_JOB_COMPLETED_STATES: frozenset[str] = frozenset(
+    {
+        "JOB_STATE_SUCCEEDED",
+        "JOB_STATE_FAILED",
+        "JOB_STATE_CANCELLED",
+        "JOB_STATE_EXPIRED",
+    }
+)
+
+
+def wait_for_batch_job(
+    client: google.genai.Client, job_name: str, initial: float = 2.0, cap: float = 60.0, factor: float = 1.5
+) -> google.genai.types.BatchJob:
+    """Polls the batch job until it reached one of ``BATCH_JOB_COMPLETED_STATES``.
+
+    Exponential backoff between the polls (``initial`` -> ``cap`` seconds) -> short jobs are noticed quickly,
+    long-running jobs are not polled needlessly often.
+    """
+    delay: float = initial
+    batch_job: google.genai.types.BatchJob = client.batches.get(name=job_name)
+    while batch_job.state.name not in BATCH_JOB_COMPLETED_STATES:  # type: ignore
+        logger.debug(f"Job {job_name} not finished. Current state: {batch_job.state.name}. Waiting {delay:.1f}s...")  # type: ignore
+        time.sleep(delay)
+        delay = min(delay * factor, cap)
+        batch_job = client.batches.get(name=job_name)
+    return batch_job
+
+
+def request_ai_batch[T](
+    airequests: List[AIRequest[T]], retries: int | None = 10
+) -> List[Tuple[Optional[str] | T | List[T], Optional[str], Optional[GenerateContentResponse]]]:
+    """Runs independent (google-)requests as ONE Gemini batch job (cheaper, one roundtrip for all of them).
+
+    All requests must target "google" with the same model (a batch job is bound to one model). Results are returned
+    in the order of ``airequests`` as ``(answer, thoughts, rawresponse)`` - like :func:`request_ai`. Failed single
+    requests yield ``(None, None, None)``; an answer not matching the ``response_schema`` is returned as text (like
+    :func:`request_gemini` does) instead of failing the whole batch.
+    """
+    if not airequests:
+        return []
+
+    model: GoogleLLMModel | AnthropicLLMModel = airequests[0].model
+    for airequest in airequests:
+        if airequest.target != "google" or not isinstance(airequest.model, GoogleLLMModel):
+            raise ValueError(f"Batch requests are only supported for target 'google', but got {airequest.target=}")
+        if airequest.model != model:
+            raise ValueError(f"All batch requests must use the same model, but got {model=} and {airequest.model=}")
+
+    import google.genai
+
+    client: google.genai.Client = _create_gemini_client(retries=retries)
+
+    inline_requests: List[google.genai.types.InlinedRequest] = [
+        google.genai.types.InlinedRequest(
+            contents=_build_gemini_contents(r), config=_build_gemini_config(r)  # type: ignore
+        )
+        for r in airequests
+    ]
 
-    # THIS WHOLE BLOCK IS NEEDED FOR MYPY TO BE HAPPY ?!
-    assert response is not None and response.candidates is not None
-    assert (
-        len(response.candidates) > 0
-        and response.candidates[0].content is not None
-        and response.candidates[0].content.parts is not None
+    batch_job: google.genai.types.BatchJob = client.batches.create(
+        model=model,
+        src=inline_requests,
+        config={"display_name": f"ai-{uuid.uuid4()}"},
     )
+    logger.debug(f"Created batch job {batch_job.name} with {len(inline_requests)} requests for {model=}")
 
-    for part in response.candidates[0].content.parts:
-        if not part.text:
+    batch_job = wait_for_batch_job(client, batch_job.name)  # type: ignore
+
+    if batch_job.state.name != "JOB_STATE_SUCCEEDED":  # type: ignore
+        raise Exception(f"Batch job {batch_job.name} did not succeed: {batch_job.state=} {batch_job.error=}")
+
+    assert batch_job.dest is not None and batch_job.dest.inlined_responses is not None
+
+    ret: List[Tuple[Optional[str] | T | List[T], Optional[str], Optional[GenerateContentResponse]]] = []
+    for airequest, inline_response in zip(airequests, batch_job.dest.inlined_responses, strict=True):
+        if inline_response.response is None:
+            logger.error(f"Batch job {batch_job.name}: request failed: {inline_response.error}")
+            ret.append((None, None, None))
             continue
 
-        if part.thought:
-            # logger.debug("Thought summary:")
-            # logger.debug(part.text)
-            thought_writer.write(part.text.strip())
-            thought_writer.write("\n")
-        else:
-            # logger.debug("Answer:")
-            # logger.debug(part.text)
-            # answer = part.text
-            answer_writer.write(part.text.strip())
-            answer_writer.write("\n")
+        answer, thoughts = _split_thoughts_and_answer(inline_response.response)
 
-    if answer_writer.tell() > 0:
-        answer = answer_writer.getvalue().strip()
+        # batch-responses do not come with .parsed -> validate against the schema here
+        if airequest.response_schema and answer is not None:
+            try:
+                ret.append(
+                    (
+                        _response_schema_adapter(airequest.response_schema).validate_json(answer),  # type: ignore  # TODO HT20251126 make it properly typed
+                        thoughts,
+                        inline_response.response,
+                    )
+                )
+                continue
+            except ValidationError as e:
+                # truncated answer/model ignoring the schema -> keep the text, the other results are still valid
+                logger.opt(exception=e).warning(f"Batch job {batch_job.name}: answer does not match the schema")
 
-    if thought_writer.tell() > 0:
-        thoughts = thought_writer.getvalue().strip()
+        ret.append((answer, thoughts, inline_response.response))
 
-    if mystuff:
-        return mystuff, thoughts, response  # type: ignore  # TODO HT20251126 make it properly typed
+    return ret
 
-    return answer, thoughts, response  # type: ignore  # TODO HT20251126 make it properly typed
+
+# target -> backend; "anthropic" adapter taken out... aka not implemented here...
+_DISPATCH: Dict[str, Callable[..., Any]] = {"google": request_gemini}
+_MODEL_TYPES: Dict[str, type] = {"google": GoogleLLMModel, "anthropic": AnthropicLLMModel}
 
 
 def request_ai[T](
@@ -242,16 +492,17 @@ def request_ai[T](
     # rawresponse: Optional[BetaMessage|GenerateContentResponse] = None
     rawresponse: Optional[GenerateContentResponse] = None
 
-    if airequest.target == "google":
-        if not isinstance(airequest.model, GoogleLLMModel):
-            raise ValueError(
-                f"When target is 'google', the model must be an instance of GoogleLLMModel, but is {airequest.model=}"
-            )
+    request_fn: Callable[..., Any] | None = _DISPATCH.get(airequest.target)
+    if request_fn is None:
+        raise NotImplementedError(f"{airequest.target=} adapter taken out... aka not implemented here...")
 
-        answer, thoughts, rawresponse = request_gemini(airequest=airequest)
+    model_type: type = _MODEL_TYPES[airequest.target]
+    if not isinstance(airequest.model, model_type):
+        raise ValueError(
+            f"When target is '{airequest.target}', the model must be an instance of {model_type.__name__}, but is {airequest.model=}"
+        )
 
-    elif airequest.target == "anthropic":
-        raise NotImplementedError("Anthropic adapter taken out... aka not implemented here...")
+    answer, thoughts, rawresponse = request_fn(airequest=airequest)
 
     # if airequest.dbrecorder:
     #     with Session(bind=DBConnectionEngine.get_instance().get_engine(autocommit=True)) as session:
@@ -265,7 +516,23 @@ def request_ai[T](
     return answer, thoughts, rawresponse
 
 
+def request_ai_parallel[T](
+    airequests: List[AIRequest[T]], max_workers: int = 10
+) -> List[Tuple[Optional[str] | T | List[T], Optional[str], Optional[GenerateContentResponse]]]:
+    """Runs independent requests concurrently (threads - the requests are pure I/O-wait).
+
+    Results are returned in the order of ``airequests``. Requests sharing a history chain must NOT go through here.
+    """
+    if not airequests:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(airequests))) as executor:
+        return list(executor.map(request_ai, airequests))
+
+
 def do_test_reqest() -> None:
+    import google.genai
+
     class Recipe(BaseModel):
         recipe_name: str
         ingredients: list[str]
@@ -336,12 +603,39 @@ def do_test_reqest() -> None:
 
         history.append(google.genai.types.UserContent(parts=[google.genai.types.Part(text=prompt)]))
 
-        # THIS WHOLE BLOCK IS NEEDED FOR MYPY TO BE HAPPY ?!
-        assert rawresponse_google is not None and rawresponse_google.candidates is not None
-        assert len(rawresponse_google.candidates) > 0 and rawresponse_google.candidates[0].content is not None
-        assert rawresponse_google.candidates[0].content.parts is not None
+        content: Optional[google.genai.types.Content] = _first_content(rawresponse_google)
+        if content is not None:
+            history.append(content)
+
+
+def do_test_batch_request() -> None:
+    class Recipe(BaseModel):
+        recipe_name: str
+        ingredients: list[str]
+
+    # independent prompts (no shared history as in do_test_reqest) -> one batch job instead of N roundtrips
+    prompts: List[str] = [
+        "List a few popular cookie recipes, and include the amounts of ingredients.",
+        "List a few popular gluten free cookie recipes, and include the amounts of ingredients.",
+    ]
+
+    airequests: List[AIRequest] = [
+        AIRequest(prompt=prompt, target="google", model=GoogleLLMModel.GEMINI_25_FLASH, response_schema=list[Recipe])
+        for prompt in prompts
+    ]
+
+    for prompt, (recipes, thoughts, _) in zip(prompts, request_ai_batch(airequests=airequests)):
+        logger.debug(f"Prompt:\n\t{prompt}")
+        logger.debug("Thoughts:")
+        logger.debug(thoughts)
+
+        if recipes is None or isinstance(recipes, str):
+            logger.debug(f"{type(recipes)=}\n{recipes}")
+        else:
+            for recipe in recipes:  # type: ignore  # TODO HT20251126 make it properly typed
+                logger.debug(get_pretty_dict_json_no_sort(recipe.model_dump()))
 
-        history.append(rawresponse_google.candidates[0].content)
+        logger.debug(f"\n\t{"*" * 30}\n")
 
 
 def do_test_image_request() -> None:
@@ -428,6 +722,7 @@ if __name__ == "__main__":
     # print(f"{mt=} {inputfile.name[:-4]=}")
 
     # do_test_reqest()
+    # do_test_batch_request()
     do_test_image_request()
 
 
@@ -1,12 +1,21 @@
-import base64
 import difflib
-import json
+import hashlib
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterator, List
+from typing import Any, Dict, Iterator, List, Literal
 
+import httpx
 import ollama
+from cachetools import LRUCache
 from loguru import logger
 from ollama import GenerateResponse
+from pydantic import BaseModel, TypeAdapter
+from rapidfuzz.distance import Levenshtein
 
 # if TYPE_CHECKING:
 #     from _typeshed import SupportsWrite
@@ -19,12 +28,36 @@ OLLAMA_HOST = "http://127.0.0.1:11434"
 
 logger.debug(f"OLLAMA_HOST: {OLLAMA_HOST}")
 
-OLLAMA_CLIENT = ollama.Client(host=OLLAMA_HOST, timeout=_OLLAMA_HTTPX_CLIENT_TIMEOUT)
+# kwargs are handed through to the underlying httpx.Client -> one keep-alive pool shared by all generate-calls
+# (the limits have to be set on the transport - httpx ignores limits= when a transport is given)
+OLLAMA_CLIENT = ollama.Client(
+    host=OLLAMA_HOST,
+    timeout=_OLLAMA_HTTPX_CLIENT_TIMEOUT,
+    transport=httpx.HTTPTransport(
+        retries=3,
+        limits=httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30),
+    ),
+)
 
 OCRTESTFILE_JPG: Path = Path(Path.home(), f"Desktop/traderjoes_h0auyjrjq1n1yshsez3z.jpg")
 
 OCR_MODEL = "deepseek-ocr:latest"
 
+# models stay loaded between calls (ollama-default: 5m idle) -> no cold-(re)load of many seconds on the critical path
+OLLAMA_KEEP_ALIVE: str = "30m"
+
+# prompt="<image>\n<|grounding|>Convert the document to markdown.",  # https://ollama.com/library/deepseek-ocr
+OCR_PROMPT = "<image>\n<|grounding|>Convert the document to markdown and count the bananas."
+
+# content-addressed (image-bytes + model + prompt) -> unchanged inputs are not OCRed again across runs
+# opt-in (OCR_CACHE=true); entries older than OCR_CACHE_MAX_AGE_DAYS or beyond the newest OCR_CACHE_MAX_ENTRIES are
+# pruned once per process before the first write
+OCR_CACHE_DIR: Path = Path(Path.home(), ".cache", "somestuff", "ollamaocr")
+OCR_CACHE_ENABLED: bool = os.getenv("OCR_CACHE", "False").lower() in ("yes", "true", "t", "y", "1")
+OCR_CACHE_MAX_AGE_DAYS: float = float(os.getenv("OCR_CACHE_MAX_AGE_DAYS", "30"))
+OCR_CACHE_MAX_ENTRIES: int = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "1000"))
+_OCR_CACHE_PRUNED: bool = False
+
 DEFAULT_OCR_SYSTEM_PROMPT = """Act as an OCR assistant. Analyze the provided image and:
     1. Recognize all visible text in the image as accurately as possible.
     2. Maintain the original structure and formatting of the text.
@@ -40,17 +73,43 @@ DEFAULT_MARKDOWN_SYSTEM_PROMPT = """Convert the provided image into Markdown for
   - Complete Content: Do not omit any part of the page, including headers, footers, and subtext."""
 
 
-def runocr(imagefile: Path) -> str:
-    image_bytes: bytes = imagefile.read_bytes()
-    image_b64: str = base64.b64encode(image_bytes).decode("utf-8")
+def _prune_ocr_cache() -> None:
+    """Removes ``OCR_CACHE_DIR``-entries older than ``OCR_CACHE_MAX_AGE_DAYS`` and all but the newest
+    ``OCR_CACHE_MAX_ENTRIES``."""
+    cutoff: float = time.time() - OCR_CACHE_MAX_AGE_DAYS * 86400
+    entries: List[tuple[float, Path]] = []
+    for f in OCR_CACHE_DIR.glob("*.txt"):
+        try:
+            entries.append((f.stat().st_mtime, f))
+        except FileNotFoundError:  # removed concurrently
+            continue
+
+    entries.sort(reverse=True)  # newest first
+    for i, (mtime, f) in enumerate(entries):
+        if i >= OCR_CACHE_MAX_ENTRIES or mtime < cutoff:
+            f.unlink(missing_ok=True)
+
+
+def runocr(image: bytes | Path) -> str:
+    global _OCR_CACHE_PRUNED
+
+    image_bytes: bytes = image if isinstance(image, bytes) else image.read_bytes()
+
+    key: str = hashlib.blake2b(
+        b"\0".join((image_bytes, OCR_MODEL.encode(), OCR_PROMPT.encode())), digest_size=16
+    ).hexdigest()
+    cachefile: Path = Path(OCR_CACHE_DIR, f"{key}.txt")
+    if OCR_CACHE_ENABLED and cachefile.is_file():
+        logger.debug(f"OCR cache hit -> {cachefile}")
+        return cachefile.read_text(encoding="utf-8")
 
     response: GenerateResponse | Iterator[GenerateResponse] = OLLAMA_CLIENT.generate(
         # system=DEFAULT_OCR_SYSTEM_PROMPT,  # ?! really needed? deepseek-ocr seems to be a bit picky
         model=OCR_MODEL,
-        # prompt="<image>\n<|grounding|>Convert the document to markdown.",  # https://ollama.com/library/deepseek-ocr
-        prompt="<image>\n<|grounding|>Convert the document to markdown and count the bananas.",
-        images=[image_b64],
+        prompt=OCR_PROMPT,
+        images=[image_bytes],  # raw bytes -> base64-encoded once by the client (a b64-str gets b64-decoded to validate)
         stream=False,
+        keep_alive=OLLAMA_KEEP_ALIVE,
     )
     if isinstance(response, Iterator):
         raise Exception("Unexpectedly got an iterator")
@@ -58,52 +117,149 @@ def runocr(imagefile: Path) -> str:
     # logger.debug(response)
     if response.response is None:
         raise Exception("Got empty response from OCR model")
+
+    if OCR_CACHE_ENABLED:
+        OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if not _OCR_CACHE_PRUNED:
+            _OCR_CACHE_PRUNED = True
+            _prune_ocr_cache()
+
+        # write to tmp + rename -> concurrent runocr-calls never see a half-written cache-file
+        tmpfile: Path = Path(OCR_CACHE_DIR, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmpfile.write_text(response.response, encoding="utf-8")
+        os.replace(tmpfile, cachefile)
+
     return response.response
 
 
-def comparedifferentfiletypes() -> List[tuple[str, str, float, int]]:
+def warmup_ocr_model() -> None:
+    """Loads ``OCR_MODEL`` (an empty prompt only loads the model) -> the first real OCR-request skips the cold-load."""
+    OLLAMA_CLIENT.generate(model=OCR_MODEL, prompt="", keep_alive=OLLAMA_KEEP_ALIVE)
+
+
+# built once -> validator-construction is not repeated per response
+_OCR_MULTI_RESULT_ADAPTER: TypeAdapter[Dict[str, str]] = TypeAdapter(Dict[str, str])
+
+
+def runocr_multi(images: Dict[str, bytes]) -> Dict[str, str]:
+    """OCRs all images in ONE request (one prefill/model-pass instead of one per image).
+
+    Returns ``{name: ocr_text}`` for the names of ``images``. Raises if the model does not return a text for
+    every image (e.g. models that do not support multiple images) -> callers fall back to per-image :func:`runocr`.
+    """
+    names: List[str] = list(images.keys())
+    schema: Dict = {
+        "type": "object",
+        "properties": {name: {"type": "string"} for name in names},
+        "required": names,
+    }
+    prompt: str = (
+        "<image>\n" * len(names)
+        + f"<|grounding|>Convert each of the {len(names)} documents to markdown and count the bananas. "
+        + f"Return JSON with one key per image in this order: {', '.join(names)}."
+    )
+
+    response: GenerateResponse | Iterator[GenerateResponse] = OLLAMA_CLIENT.generate(
+        model=OCR_MODEL,
+        prompt=prompt,
+        images=list(images.values()),
+        format=schema,
+        stream=False,
+        keep_alive=OLLAMA_KEEP_ALIVE,
+    )
+    if isinstance(response, Iterator):
+        raise Exception("Unexpectedly got an iterator")
+
+    if response.response is None:
+        raise Exception("Got empty response from OCR model")
+
+    # parsed + validated in one pass by pydantic-core (non-str values raise a ValidationError)
+    results: Dict[str, str] = _OCR_MULTI_RESULT_ADAPTER.validate_json(response.response)
+    missing: List[str] = [name for name in names if name not in results]
+    if missing:
+        raise ValueError(f"OCR model did not return results for {missing=}")
+    return {name: results[name] for name in names}
+
+
+def runocr_parallel(images: Dict[str, bytes]) -> Dict[str, str]:
+    # OCR-requests are pure wait-time on the ollama-server -> dispatch all at once (needs OLLAMA_NUM_PARALLEL>=n)
+    with ThreadPoolExecutor(max_workers=len(images)) as executor:
+        futures: Dict[str, Future[str]] = {name: executor.submit(runocr, b) for name, b in images.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def count_changed_chars(prev: str, resp: str) -> int:
+    """Number of characters changed (replaced/deleted/inserted) between ``prev`` and ``resp``."""
+    # C-implementation -> edit-distance == sum of the changed chars of an optimal alignment
+    return int(Levenshtein.distance(prev, resp))
+
+
+_RATIO = itemgetter(2)  # (from, to, ratio, changed_chars) -> ratio
+
+
+def comparedifferentfiletypes(batched: bool = False, top_k: int | None = None) -> List[tuple[str, str, float, int]]:
+    """OCRs the test-image in different file-formats and compares the results pairwise.
+
+    ``batched=True`` sends all images in one multi-image request (falls back to one request per image if the model
+    does not cope with that). NOTE: in one request, the model sees all formats at once -> the results are not
+    independent of each other anymore.
+
+    Returns the comparisons sorted by change-ratio (ascending) - only the ``top_k`` ones if given.
+    """
     # encoded = base64.b64encode(b'data to be encoded')
 
     # difflib.unified_diff(redo_resps[0], redo_resps[1],
     #                                   fromfile=f"NO_HISTORY", tofile=f"WITH_HISTORY"):
 
-    result_lines: Dict[str, List[str] | None] = {"webp": None, "png": None, "jpg": None}
-    result_texts: Dict[str, str | None] = {"webp": None, "png": None, "jpg": None}
+    inputfiles: Dict[str, Path] = {
+        suff: Path(OCRTESTFILE_JPG.parent, f"{OCRTESTFILE_JPG.name[:-4]}.{suff}") for suff in ("webp", "png", "jpg")
+    }
+    logger.debug(f"Input files: {inputfiles}")
 
-    for suff in result_texts.keys():
-        inputfile: Path = Path(OCRTESTFILE_JPG.parent, f"{OCRTESTFILE_JPG.name[:-4]}.{suff}")
-        logger.debug(f"Input file: {inputfile}")
+    # read once -> shared by the (multi-image or per-image) OCR-requests and their cache-lookups
+    images: Dict[str, bytes] = {suff: inputfile.read_bytes() for suff, inputfile in inputfiles.items()}
 
-        resp: str = runocr(inputfile)
+    ocr_results: Dict[str, str] | None = None
+    if batched:
+        try:
+            ocr_results = runocr_multi(images)
+        except Exception as e:
+            logger.warning(f"Multi-image OCR failed -> falling back to one request per image: {e}")
+
+    if ocr_results is None:
+        ocr_results = runocr_parallel(images)
+
+    # split once per result -> shared by all pairs' unified_diff; the texts themselves are only referenced from
+    # ocr_results (no second copy)
+    result_lines: Dict[str, List[str]] = {}
+    for suff, resp in ocr_results.items():
 
         logger.debug(f"Got OCR result for .{suff}:")
         logger.debug(resp)
 
         result_lines[suff] = resp.splitlines()
-        result_texts[suff] = resp
 
     comparisons: List[tuple[str, str, float, int]] = []  # (from, to, ratio, changed_chars)
+    # (png,jpg) and (jpg,png) -> same number of changed chars -> computed only once per pair
+    changed_chars_by_pair: Dict[frozenset[str], int] = {}
 
-    for psuff in result_texts.keys():
-        prevl: List[str] = result_lines[psuff]  # type: ignore
-        prev: str = result_texts[psuff]  # type: ignore
+    for psuff, prev in ocr_results.items():
+        prevl: List[str] = result_lines[psuff]
 
-        for suff in result_texts.keys():
+        for suff, resp in ocr_results.items():
             if psuff == suff:
                 continue
 
-            respl: List[str] = result_lines[suff]  # type: ignore
-            resp = result_texts[suff]  # type: ignore
+            respl: List[str] = result_lines[suff]
 
-            matcher = difflib.SequenceMatcher(None, prev, resp)
-            changed_chars: int = 0
-            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-                if tag == "replace":
-                    changed_chars += max(i2 - i1, j2 - j1)
-                elif tag == "delete":
-                    changed_chars += i2 - i1
-                elif tag == "insert":
-                    changed_chars += j2 - j1
+            pair: frozenset[str] = frozenset((psuff, suff))
+            changed_chars: int
+            if prev == resp:
+                changed_chars = 0
+            elif pair in changed_chars_by_pair:
+                changed_chars = changed_chars_by_pair[pair]
+            else:
+                changed_chars = changed_chars_by_pair[pair] = count_changed_chars(prev, resp)
 
             # Berechne die Signifikanz der Änderungen
             max_total_chars: int = max(len(prev), len(resp))
@@ -118,28 +274,98 @@ def comparedifferentfiletypes() -> List[tuple[str, str, float, int]]:
             logger.debug(f"DIFF [{changed_chars=} {psuff} -> {suff}]:")
             logger.debug(f"Change ratio: {change_ratio:.2%} - {'SIGNIFICANT' if is_significant else 'MINOR'}")
 
+            if changed_chars == 0:
+                continue  # identical -> empty diff
+
             d = difflib.unified_diff(prevl, respl, fromfile=psuff, tofile=suff)
 
             unified_diff_str: str = "\n".join(d)
 
             logger.debug(unified_diff_str)
 
-    comparisons.sort(key=lambda x: x[2])  # 2: ratio
+    if top_k is not None:
+        return heapq.nsmallest(top_k, comparisons, key=_RATIO)  # O(n log k) instead of sorting everything
 
-    return comparisons
+    comparisons.sort(key=_RATIO)
 
+    return comparisons
 
-# TODO HT20251126 implement/check/validate this
-def llm_semantic_comparison(text1: str, text2: str) -> Dict:
-    """Lasse LLM die semantische Ähnlichkeit bewerten"""
 
-    prompt = f"""Compare these two OCR results and provide a structured analysis:
+def generate_json(**kwargs: Any) -> str:
+    """Streams ``OLLAMA_CLIENT.generate(**kwargs)`` and stops as soon as the top-level JSON object is closed.
+
+    Trailing tokens after the closing brace are never waited for - closing the stream drops the connection which
+    makes the ollama-server abort the generation (and free its slot).
+    """
+    kwargs.setdefault("keep_alive", OLLAMA_KEEP_ALIVE)
+    stream: Iterator[GenerateResponse] = OLLAMA_CLIENT.generate(**kwargs, stream=True)
+    chunks: List[str] = []
+    depth: int = 0
+    started: bool = False
+    in_string: bool = False
+    escaped: bool = False
+    try:
+        for chunk in stream:
+            text: str = chunk.response or ""
+            chunks.append(text)
+            for ch in text:
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch in "{[":
+                    depth += 1
+                    started = True
+                elif ch in "}]":
+                    depth -= 1
+                    if started and depth == 0:
+                        return "".join(chunks)
+    finally:
+        stream.close()  # type: ignore[attr-defined]
+
+    return "".join(chunks)
+
+
+class SemanticComparison(BaseModel):
+    semantic_similarity: float
+    critical_differences: int
+    structural_similarity: float
+    better_result: Literal["text1", "text2"]
+    confidence: float
+    explanation: str
+
+
+class DifferenceCategorization(BaseModel):
+    critical_count: int
+    moderate_count: int
+    minor_count: int
+    noise_count: int
+    significance_score: float
+    most_concerning: str
+
+
+class EnsembleResult(BaseModel):
+    best_format: str
+    confidence: float
+    reasoning: str
+    combined_text: str
+
+
+# static prompt-parts and json-schemas built once at import -> only the variable fields are concatenated per call
+_SEMANTIC_PROMPT_HEAD: str = """Compare these two OCR results and provide a structured analysis:
 
 TEXT 1:
-{text1}
+"""
+_SEMANTIC_SEP: str = """
 
 TEXT 2:
-{text2}
+"""
+_SEMANTIC_PROMPT_TAIL: str = """
 
 Analyze:
 1. Semantic similarity (0-100%): Do they convey the same meaning?
@@ -148,32 +374,21 @@ Analyze:
 4. Overall quality score (0-100): Which text is more accurate?
 
 Return ONLY valid JSON:
-{{
+{
   "semantic_similarity": <percentage>,
   "critical_differences": <count>,
   "structural_similarity": <percentage>,
   "better_result": "text1" or "text2",
   "confidence": <percentage>,
   "explanation": "<brief reason>"
-}}"""
+}"""
+_SEMANTIC_COMPARISON_SCHEMA: Dict[str, Any] = SemanticComparison.model_json_schema()
 
-    response = OLLAMA_CLIENT.generate(
-        model="deepseek-r1:latest", prompt=prompt, format="json", stream=False  # oder ein anderes reasoning model
-    )
-
-    if response.response is None:
-        raise Exception("Got empty response from LLM")
-    return json.loads(response.response)
-
-
-# TODO HT20251126 implement/check/validate this
-def llm_categorize_differences(text1: str, text2: str, diff_str: str) -> Dict:
-    """Lasse LLM die Unterschiede kategorisieren"""
-
-    prompt = f"""You are analyzing differences between two OCR results of the same image.
+_CATEGORIZE_PROMPT_HEAD: str = """You are analyzing differences between two OCR results of the same image.
 
 DIFF:
-{diff_str}
+"""
+_CATEGORIZE_PROMPT_TAIL: str = """
 
 Categorize each difference as:
 - CRITICAL: Numbers, amounts, names, dates changed
@@ -182,20 +397,102 @@ Categorize each difference as:
 - NOISE: OCR artifacts, formatting only
 
 Return JSON:
-{{
+{
   "critical_count": <number>,
   "moderate_count": <number>,
   "minor_count": <number>,
   "noise_count": <number>,
   "significance_score": <0-100>,
   "most_concerning": "<description of worst error if any>"
-}}"""
+}"""
+_DIFFERENCE_CATEGORIZATION_SCHEMA: Dict[str, Any] = DifferenceCategorization.model_json_schema()
+
+_ENSEMBLE_PROMPT_HEAD: str = "<image>\n\nYou have "
+_ENSEMBLE_PROMPT_RESULTS: str = """ OCR results of the same image. 
+Analyze them and determine which is most accurate by:
+1. Checking internal consistency
+2. Identifying obvious OCR errors
+3. Comparing completeness
 
-    response = OLLAMA_CLIENT.generate(model="deepseek-r1:latest", prompt=prompt, format="json", stream=False)
+RESULTS:
+"""
+_ENSEMBLE_PROMPT_TAIL: str = """
+
+Return JSON with your analysis:
+{
+  "best_format": "<format>",
+  "confidence": <0-100>,
+  "reasoning": "<why this is best>",
+  "combined_text": "<your corrected/improved version>"
+}"""
+_ENSEMBLE_RESULT_SCHEMA: Dict[str, Any] = EnsembleResult.model_json_schema()
+
+# blake2b-digest of the prompt-inputs -> result (the texts themselves are too long to be used as keys)
+# bounded (LRU) and only touched under _LLM_CACHE_LOCK -> the lock is not held during the (slow) llm-call itself, so two
+# threads may both compute a missing key; the later store simply overwrites the equivalent result
+_SEMANTIC_COMPARISON_CACHE: LRUCache[bytes, SemanticComparison] = LRUCache(maxsize=256)
+_DIFFERENCE_CATEGORIZATION_CACHE: LRUCache[bytes, DifferenceCategorization] = LRUCache(maxsize=256)
+_LLM_CACHE_LOCK: threading.Lock = threading.Lock()
+
+
+def _content_key(*parts: str) -> bytes:
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).digest()
+
+
+# TODO HT20251126 implement/check/validate this
+def llm_semantic_comparison(text1: str, text2: str) -> SemanticComparison:
+    """Lasse LLM die semantische Ähnlichkeit bewerten"""
+
+    # (a, b) and (b, a) share one cache-entry -> only ``better_result`` has to be mirrored for the swapped order
+    swapped: bool = text2 < text1
+    if swapped:
+        text1, text2 = text2, text1
+
+    key: bytes = _content_key(text1, text2)
+    with _LLM_CACHE_LOCK:
+        result: SemanticComparison | None = _SEMANTIC_COMPARISON_CACHE.get(key)
+    if result is None:
+        result = _llm_semantic_comparison(text1, text2)
+        with _LLM_CACHE_LOCK:
+            _SEMANTIC_COMPARISON_CACHE[key] = result
+
+    if swapped:
+        return result.model_copy(update={"better_result": "text1" if result.better_result == "text2" else "text2"})
+    return result
+
+
+def _llm_semantic_comparison(text1: str, text2: str) -> SemanticComparison:
+    prompt: str = _SEMANTIC_PROMPT_HEAD + text1 + _SEMANTIC_SEP + text2 + _SEMANTIC_PROMPT_TAIL
+
+    # schema-constrained decoding -> no filler-tokens around the json
+    response: str = generate_json(
+        model="deepseek-r1:latest",  # oder ein anderes reasoning model
+        prompt=prompt,
+        format=_SEMANTIC_COMPARISON_SCHEMA,
+    )
+
+    return SemanticComparison.model_validate_json(response)
 
-    if response.response is None:
-        raise Exception("Got empty response from LLM")
-    return json.loads(response.response)
+
+# TODO HT20251126 implement/check/validate this
+def llm_categorize_differences(text1: str, text2: str, diff_str: str) -> DifferenceCategorization:
+    """Lasse LLM die Unterschiede kategorisieren"""
+
+    # the prompt only contains the diff -> it alone identifies the result
+    key: bytes = _content_key(diff_str)
+    with _LLM_CACHE_LOCK:
+        cached_result: DifferenceCategorization | None = _DIFFERENCE_CATEGORIZATION_CACHE.get(key)
+    if cached_result is not None:
+        return cached_result
+
+    prompt: str = _CATEGORIZE_PROMPT_HEAD + diff_str + _CATEGORIZE_PROMPT_TAIL
+
+    response: str = generate_json(model="deepseek-r1:latest", prompt=prompt, format=_DIFFERENCE_CATEGORIZATION_SCHEMA)
+
+    result: DifferenceCategorization = DifferenceCategorization.model_validate_json(response)
+    with _LLM_CACHE_LOCK:
+        _DIFFERENCE_CATEGORIZATION_CACHE[key] = result
+    return result
 
 
 # from pydantic import BaseModel
@@ -214,42 +511,49 @@ Return JSON:
 
 
 # TODO HT20251126 implement/check/validate this
-def llm_ensemble_best_result(results: Dict[str, str], image_b64: str) -> str:
+def llm_ensemble_best_result(results: Dict[str, str], image_bytes: bytes) -> EnsembleResult:
     """Lasse LLM aus mehreren OCR-Ergebnissen das beste auswählen"""
 
-    results_text = "\n\n---\n\n".join([f"RESULT {fmt.upper()}:\n{text}" for fmt, text in results.items()])
-
-    prompt = f"""You have {len(results)} OCR results of the same image. 
-Analyze them and determine which is most accurate by:
-1. Checking internal consistency
-2. Identifying obvious OCR errors
-3. Comparing completeness
-
-RESULTS:
-{results_text}
+    results_text: str = "\n\n---\n\n".join([f"RESULT {fmt.upper()}:\n{text}" for fmt, text in results.items()])
 
-Return JSON with your analysis:
-{{
-  "best_format": "<format>",
-  "confidence": <0-100>,
-  "reasoning": "<why this is best>",
-  "combined_text": "<your corrected/improved version>"
-}}"""
+    prompt: str = (
+        _ENSEMBLE_PROMPT_HEAD + str(len(results)) + _ENSEMBLE_PROMPT_RESULTS + results_text + _ENSEMBLE_PROMPT_TAIL
+    )
 
-    response = OLLAMA_CLIENT.generate(
+    response: str = generate_json(
         model=OCR_MODEL,
-        prompt=f"<image>\n\n{prompt}",
-        images=[image_b64],
-        format="json",  # format=Country.model_json_schema(),
-        stream=False,
+        prompt=prompt,
+        images=[image_bytes],
+        format=_ENSEMBLE_RESULT_SCHEMA,
     )
 
-    if response.response is None:
-        raise Exception("Got empty response from LLM")
-    return json.loads(response.response)
+    return EnsembleResult.model_validate_json(response)
+
+
+def pipelined_semantic_comparisons(images: Dict[str, bytes]) -> Dict[tuple[str, str], SemanticComparison]:
+    """OCRs ``images`` and runs :func:`llm_semantic_comparison` on every pair as soon as both of its OCR-results are
+    there (instead of waiting for all OCR-requests first) -> reasoning- and OCR-requests overlap on the ollama-server.
 
+    Returns ``{(name1, name2): comparison}`` with ``text1``/``text2`` of the comparison being the OCR-results of
+    ``name1``/``name2``.
+    """
+    n: int = len(images)
+    llm_futures: Dict[tuple[str, str], Future[SemanticComparison]] = {}
+    # one worker per OCR-request and per pair -> nothing queues client-side
+    with ThreadPoolExecutor(max_workers=n + n * (n - 1) // 2) as executor:
+        ocr_futures: Dict[Future[str], str] = {executor.submit(runocr, b): name for name, b in images.items()}
+        ocr_results: Dict[str, str] = {}
+        for future in as_completed(ocr_futures):
+            name: str = ocr_futures[future]
+            text: str = future.result()
+            for other, other_text in ocr_results.items():
+                llm_futures[(other, name)] = executor.submit(llm_semantic_comparison, other_text, text)
+            ocr_results[name] = text
 
-# def comprehensive_comparison(results: Dict[str, str], image_b64: str) -> Dict:
+    return {pair: future.result() for pair, future in llm_futures.items()}
+
+
+# def comprehensive_comparison(results: Dict[str, str], image_bytes: bytes) -> Dict:
 #     """Kombiniere mehrere Metriken für robuste Bewertung"""
 #
 #     comparisons = []
@@ -296,7 +600,7 @@ Return JSON with your analysis:
 #             comp['llm_analysis'] = llm_analysis
 #
 #     # Phase 3: Finale Empfehlung
-#     best_format = llm_ensemble_best_result(results, image_b64)
+#     best_format = llm_ensemble_best_result(results, image_bytes)
 #
 #     return {
 #         'comparisons': comparisons,
@@ -305,6 +609,8 @@ Return JSON with your analysis:
 
 
 def main() -> None:
+    warmup_ocr_model()
+
     comparisons: List[tuple[str, str, float, int]] = comparedifferentfiletypes()
 
     logger.info("\n=== TOPliste mit geringster Change Ratio ===")
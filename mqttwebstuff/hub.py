@@ -62,6 +62,11 @@ def anchor_slug(text: str) -> str:
 #: fully anyway, so drops only cost intermediate states).
 _QUEUE_MAXSIZE = 256
 
+#: Leading bytes :func:`decode_payload` skips before peeking for JSON: a
+#: UTF-8 BOM, then ASCII whitespace and the two bytes of a UTF-8 NBSP.
+_UTF8_BOM = b"\xef\xbb\xbf"
+_PEEK_SKIP_BYTES = b" \t\n\r\x0b\x0c\xc2\xa0"
+
 
 @dataclass(slots=True)
 class _Entry:
@@ -82,8 +87,21 @@ def decode_payload(raw: str | bytes) -> Any:
     Returns:
         ``dict``/``list``/scalar for valid JSON, otherwise the decoded string.
     """
-    text = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
-    stripped = text.strip()
+    if isinstance(raw, bytes):
+        # Peek at the raw bytes first: plain-text payloads (the common case
+        # for scalar sensor values) are decoded once and returned, without
+        # the str-side strip/startswith. A leading UTF-8 BOM, ASCII whitespace
+        # and NBSP (its UTF-8 bytes) are skipped for the peek; removeprefix()
+        # and lstrip() return ``raw`` itself when there is nothing to drop, so
+        # the peek does not copy.
+        if raw.removeprefix(_UTF8_BOM).lstrip(_PEEK_SKIP_BYTES)[:1] not in (b"{", b"["):
+            return raw.decode("utf-8", errors="replace")
+        text = raw.decode("utf-8", errors="replace")
+    else:
+        text = raw
+    # str.strip() also drops unicode whitespace (e.g. NBSP); a BOM is no
+    # whitespace and is dropped explicitly.
+    stripped = text.lstrip("\ufeff").strip()
     if stripped.startswith(("{", "[")):
         try:
             return json.loads(stripped)
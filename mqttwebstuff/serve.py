@@ -28,7 +28,7 @@ import typer
 import uvicorn
 from dotenv import load_dotenv
 from mqttstuff import MosquittoClientWrapper
-from mqttstuff.mosquittomqttwrapper import MWMqttMessage
+from paho.mqtt.client import Client, MQTTMessage
 
 from mqttwebstuff import configure_logging, print_banner
 from mqttwebstuff.hub import ViewHub
@@ -94,13 +94,16 @@ def _build_mqtt_client(
         tls_insecure=tls_insecure,
     )
 
-    def _on_message(msg: MWMqttMessage, userdata: object) -> None:
+    def _on_message(_client: Client, userdata: object, msg: MQTTMessage) -> None:
         # Runs on paho's network thread; hub.submit trampolines into the loop.
-        if isinstance(msg.value, str):
-            hub.submit(msg.topic, msg.value)
+        hub.submit(msg.topic, msg.payload)
 
-    # str_raw hands us the undecoded payload text; JSON detection lives in the hub.
-    client.set_on_msg_callback(_on_message, rettype="str_raw")
+    # Registered on the paho client directly instead of via set_on_msg_callback:
+    # the wrapper would decode the payload and build + validate an MWMqttMessage
+    # per message only for us to take the text back out. The hub gets the raw
+    # bytes; decoding and JSON detection live there (decode_payload).
+    assert client.client is not None
+    client.client.on_message = _on_message
     return client
 
 
@@ -1,26 +1,23 @@
 import datetime
 import json
 import os
+import random
+import shutil
 import sys
 import time
 from datetime import timedelta
-from os.path import exists, expanduser
+from os.path import expanduser
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import pytz
-import schedule
 from mqttstuff.mosquittomqttwrapper import MosquittoClientWrapper, MWMqttMessage
+from paho.mqtt.client import MQTTMessageInfo
 
-# https://github.com/dbader/schedule
-from schedule import run_pending
-
-import config
 import Helper
 from config import _EFFECTIVE_CONFIG as effconfig  # dirty.
-from config import settings
+from config import TIMEZONE, settings, str2bool
 
-_tzberlin: datetime.tzinfo = pytz.timezone("Europe/Berlin")
+_tzberlin: datetime.tzinfo = TIMEZONE  # stdlib ZoneInfo (config.TIMEZONE) instead of pytz
 
 from loguru import logger
 
@@ -31,6 +28,62 @@ logger.add(sys.stderr, level=os.getenv("LOGURU_LEVEL"))  # type: ignore  # TRACE
 
 NOSENDMOSQUITTO: bool = False
 
+# full json dumps of the getstationsdata response/station/modules (10-50KB per job) only on demand -> even at DEBUG
+# the one-line summaries (temperature, rain, pressure, module names) are normally all that's needed
+NETATMO_FULL_DUMP: bool = str2bool(os.getenv("NETATMO_FULL_DUMP", "False"))
+
+
+def _valuemsg_payload(msg: MWMqttMessage) -> float | str | None:
+    # same wire format as MosquittoClientWrapper.publish_multiple for rettype "valuemsg"
+    if msg.value is None or not msg.metadata:
+        return json.dumps(msg.value, default=str) if isinstance(msg.value, dict) else msg.value
+
+    payload_data: Dict[str, Any] = {"value": msg.value, **msg.metadata}
+    if msg.valuedt is not None:
+        payload_data["created_at"] = msg.valuedt.isoformat(timespec="milliseconds")
+
+    return json.dumps(payload_data, default=str)
+
+
+def _publish_all(mqttclient: MosquittoClientWrapper, msgs: List[MWMqttMessage]) -> List[bool]:
+    # publish_multiple waits for each (qos=1 -> PUBACK roundtrip) before the next one is even queued
+    # -> queue all of them first so paho writes them back to back, then wait for the acks
+    assert mqttclient.client is not None
+
+    pending: List[MQTTMessageInfo | None] = []
+    for msg in msgs:
+        try:
+            pending.append(
+                mqttclient.client.publish(
+                    topic=msg.topic, payload=_valuemsg_payload(msg), retain=msg.retained, qos=msg.qos
+                )
+            )
+        except Exception as ex:
+            logger.opt(exception=ex).error(ex)
+            pending.append(None)
+
+    ret: List[bool] = []
+    for msginfo in pending:
+        if msginfo is None:
+            ret.append(False)
+            continue
+
+        try:
+            msginfo.wait_for_publish()
+            ret.append(True)
+        except Exception as ex:
+            logger.opt(exception=ex).error(ex)
+            ret.append(False)
+
+    return ret
+
+
+# settings are loaded once at import -> resolve the netatmo topics (+ their qos) once instead of on every publish
+# effconfig["mqtt_topics"]["netatmo"]
+_NETATMO_TOPIC_MAP: Dict[str, Tuple[str, int]] = {
+    k: (t.topic, t.qos) for k, t in settings.mqtt_topics.root.get("netatmo", {}).items()
+}
+
 
 def send_to_mosquitto(
     mqttclient: MosquittoClientWrapper,
@@ -54,157 +107,138 @@ def send_to_mosquitto(
     # assert "ecowitt" in effconfig["mqtt_topics"] and isinstance(effconfig["mqtt_topics"]["ecowitt"], dict)
     # assert "pressure" in effconfig["mqtt_topics"]["ecowitt"] and isinstance(effconfig["mqtt_topics"]["ecowitt"]["pressure"], dict)
 
-    # msgs: List[Tuple[str, Union[int, float, str, Dict], Optional[datetime.datetime], Optional[Dict]]] = []
-    msgs: List[MWMqttMessage] = []
-
-    netatmo_topics: Dict[str, config.MqttTopic] = settings.mqtt_topics.root.get(
-        "netatmo", {}
-    )  # effconfig["mqtt_topics"]["netatmo"]
-    # assert isinstance(netatmo_topics, dict)
-
-    metadata: Dict[str, Any] = effconfig["mqtt_message_default_metadata"].copy()
-    # NOPE: copy just to make sure not to change the original/have some memory problems after a while due to references
-    # for that reason metadata is already/will be copied in MosquittoClientWrapper.publish or MosquittoClientWrapper.publish_multiple
-
-    # msgs: List[Tuple[str, Union[int, float, str, Dict], Optional[datetime.datetime], Optional[Dict]]] = []
-    topic: str | None
+    # no copy: _publish_all (like MosquittoClientWrapper.publish_multiple) builds a fresh payload dict per message
+    # and never writes into the metadata it is handed
+    metadata: Dict[str, Any] = effconfig["mqtt_message_default_metadata"]
 
     logger.debug("Crontanamo::send_to_mosquitto::netatmo_topics:")
-    logger.debug(Helper.get_pretty_dict_json_no_sort(netatmo_topics))
-
-    logger.debug(f"Crontanamo::send_to_mosquitto::{temp=}")
-    if temp is not None:
-        assert "temperature" in netatmo_topics
-        topic = netatmo_topics["temperature"].topic
-
-        logger.debug(f"\t{topic=}")
-        if topic is not None:
-            msgs.append(
-                MWMqttMessage(
-                    topic=topic,
-                    value=temp,
-                    valuedt=created_at_temp,
-                    retained=True,
-                    metadata=metadata,
-                    rettype="valuemsg",
-                    qos=1,
-                )
-            )
-
-    logger.debug(f"Crontanamo::send_to_mosquitto::{rain=}")
-    if rain is not None:
-        assert "rain" in netatmo_topics
-        topic = netatmo_topics["rain"].topic
-
-        logger.debug(f"\t{topic=}")
-        if topic is not None:
-            msgs.append(
-                MWMqttMessage(
-                    topic=topic,
-                    value=rain,
-                    valuedt=created_at_rain,
-                    retained=True,
-                    metadata=metadata,
-                    rettype="valuemsg",
-                    qos=1,
-                )
-            )
-
-    logger.debug(f"Crontanamo::send_to_mosquitto::{rain1h=}")
-    if rain1h is not None:
-        assert "rain1h" in netatmo_topics
-        topic = netatmo_topics["rain1h"].topic
-
-        logger.debug(f"\t{topic=}")
-        if topic is not None:
-            msgs.append(
-                MWMqttMessage(
-                    topic=topic,
-                    value=rain1h,
-                    valuedt=created_at_rain1h,
-                    retained=True,
-                    metadata=metadata,
-                    rettype="valuemsg",
-                    qos=1,
-                )
-            )
+    # lazy -> pretty-printing only happens if a DEBUG sink is active
+    logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(_NETATMO_TOPIC_MAP))
 
-    logger.debug(f"Crontanamo::send_to_mosquitto::{rain24h=}")
-    if rain24h is not None:
-        assert "rain24h" in netatmo_topics
-        topic = netatmo_topics["rain24h"].topic
-
-        logger.debug(f"\t{topic=}")
-        if topic is not None:
-            msgs.append(
-                MWMqttMessage(
-                    topic=topic,
-                    value=rain24h,
-                    valuedt=created_at_rain24h,
-                    retained=True,
-                    metadata=metadata,
-                    rettype="valuemsg",
-                    qos=1,
-                )
-            )
-
-    logger.debug(f"Crontanamo::send_to_mosquitto::{pressure=} {absolute_pressure=}")
+    pd: Optional[Dict[str, float]] = None
     if pressure is not None or absolute_pressure is not None:
-        pd: Dict[str, float] = {}
+        pd = {}
         if pressure is not None:
             pd["pressure"] = pressure
         if absolute_pressure is not None:
             pd["absolute_pressure"] = absolute_pressure
 
-        assert "pressure" in netatmo_topics
-        topic = netatmo_topics["pressure"].topic
-
-        logger.debug(f"\t{topic=}")
-        if topic is not None:
-            msgs.append(
-                MWMqttMessage(
-                    topic=topic,
-                    value=pd,
-                    valuedt=created_at_pressure,
-                    retained=True,
-                    metadata=metadata,
-                    rettype="valuemsg",
-                    qos=1,
-                )
+    # (topic-key, value, created_at) -> published in this order, None-values are skipped
+    fields: Tuple[Tuple[str, Optional[float | Dict[str, float]], Optional[datetime.datetime]], ...] = (
+        ("temperature", temp, created_at_temp),
+        ("rain", rain, created_at_rain),
+        ("rain1h", rain1h, created_at_rain1h),
+        ("rain24h", rain24h, created_at_rain24h),
+        ("pressure", pd, created_at_pressure),
+    )
+
+    msgs: List[MWMqttMessage] = []
+    for key, value, created_at in fields:
+        logger.debug(f"Crontanamo::send_to_mosquitto::{key}={value}")
+        if value is None:
+            continue
+
+        assert key in _NETATMO_TOPIC_MAP
+        topic, qos = _NETATMO_TOPIC_MAP[key]
+        logger.debug(f"\t{topic=} {qos=}")
+
+        msgs.append(
+            MWMqttMessage(
+                topic=topic,
+                value=value,
+                valuedt=created_at,
+                retained=True,
+                metadata=metadata,
+                rettype="valuemsg",
+                qos=qos,
             )
+        )
 
     if NOSENDMOSQUITTO:
         logger.debug(f"{NOSENDMOSQUITTO=}")
         logger.debug(msgs)
         return
 
-    send_results: List[bool] = mqttclient.publish_multiple(msgs)
+    send_results: List[bool] = _publish_all(mqttclient, msgs)
     logger.debug(f"Crontanamo::send_to_mosquitto::send_results:")
     for i, res in enumerate(send_results):
         logger.debug(f"{msgs[i].topic} -> {res}")
 
 
+_CREDENTIALS: str = expanduser("~/.netatmo.credentials")
+_CREDENTIALS_PATH: Path = Path(_CREDENTIALS)
+# copy on the shared volume (if any), see write_netatmo_credentials_to_shared_file
+_SHARED_CREDENTIALS: Optional[str] = (
+    os.environ["STORAGEPATH"] + "/netatmo.credentials" if os.getenv("STORAGEPATH") else None
+)
+
+# path -> (st_mtime_ns, st_size, parsed json) -> unchanged credential files are not re-read/re-parsed every job
+_cred_cache: Dict[str, Tuple[int, int, dict]] = {}
+
+
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    # one stat instead of exists() + stat()
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def _read_credentials_cached(path: str, st: Optional[os.stat_result] = None) -> dict:
+    if st is None:
+        st = os.stat(path)
+    cached: Optional[Tuple[int, int, dict]] = _cred_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    with open(path, "r") as fin:
+        data: dict = json.load(fin)
+
+    _cred_cache[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def _write_credentials(path: str, data: dict) -> None:
+    # tmp + rename -> a crash/concurrent reader never sees a truncated credentials file (refresh-token would be lost)
+    tmppath: str = f"{path}.{os.getpid()}.tmp"
+    with open(tmppath, "w") as f:
+        f.write(json.dumps(data, indent=True))
+    os.replace(tmppath, path)
+
+    # what was just written is what a re-read would parse -> no need to invalidate (stat of the final path)
+    st: os.stat_result = os.stat(path)
+    _cred_cache[path] = (st.st_mtime_ns, st.st_size, data)
+
+
 def write_netatmo_credentials_to_shared_file() -> None:
     logger.debug("Crontanamo::write_netatmo_credentialsfileshared")
 
-    if os.getenv("STORAGEPATH"):
+    if _SHARED_CREDENTIALS is not None:
         logger.debug("STORAGEPATH is in ENV (" + os.environ["STORAGEPATH"] + ")")
 
-        credentials = expanduser("~/.netatmo.credentials")
+        credentials = _CREDENTIALS
 
-        if exists(credentials):
+        crstat: Optional[os.stat_result] = _stat_or_none(credentials)
+        if crstat is not None:
             logger.debug(f"{credentials} EXISTS -> preparing copy")
 
-            credentials2 = os.environ["STORAGEPATH"] + "/netatmo.credentials"
+            credentials2 = _SHARED_CREDENTIALS
 
-            with open(credentials, "r") as fin:
-                netatmo_data = json.load(fin)
+            # if "ACCESS_TOKEN" not in netatmo_data and os.getenv("_NETATMO_ACCESS_TOKEN"):
+            #     netatmo_data["ACCESS_TOKEN"] = os.environ["_NETATMO_ACCESS_TOKEN"]
 
-                # if "ACCESS_TOKEN" not in netatmo_data and os.getenv("_NETATMO_ACCESS_TOKEN"):
-                #     netatmo_data["ACCESS_TOKEN"] = os.environ["_NETATMO_ACCESS_TOKEN"]
+            # plain byte copy (no json load + dump) into a temp file which is then renamed over the target
+            # -> readers on the shared volume never see a half-written file (pid-unique: several jobs/containers may
+            # share the volume and must not clobber each other's temp file)
+            credentials2_tmp: str = f"{credentials2}.{os.getpid()}.tmp"
+            shutil.copyfile(credentials, credentials2_tmp)
+            os.replace(credentials2_tmp, credentials2)
 
-                with open(credentials2, "w") as f:
-                    f.write(json.dumps(netatmo_data, indent=True))
+            # same bytes -> same parsed content; spares the re-parse on the next newer-than check
+            cached: Optional[Tuple[int, int, dict]] = _cred_cache.get(credentials)
+            if cached is not None and cached[0] == crstat.st_mtime_ns and cached[1] == crstat.st_size:
+                cr2stat: os.stat_result = os.stat(credentials2)
+                _cred_cache[credentials2] = (cr2stat.st_mtime_ns, cr2stat.st_size, cached[2])
     else:
         logger.debug("STORAGEPATH is NOT set")
 
@@ -212,34 +246,36 @@ def write_netatmo_credentials_to_shared_file() -> None:
 def ensure_up2date_netatmo_credentialsfile() -> dict:
     logger.debug("Crontanamo::ensure_netatmo_credentialsfile")
     netatmo_data: dict = {}
-    credentials = expanduser("~/.netatmo.credentials")
-    if exists(credentials):
+    credentials = _CREDENTIALS
+    crstat: Optional[os.stat_result] = _stat_or_none(credentials)
+    if crstat is not None:
         logger.debug(f"{credentials} exists")
 
-        with open(credentials, "r") as fin:
-            netatmo_data = json.load(fin)
+        netatmo_data = _read_credentials_cached(credentials, crstat)
 
-        if os.getenv("STORAGEPATH"):
-            credentials2 = os.environ["STORAGEPATH"] + "/netatmo.credentials"
+        if _SHARED_CREDENTIALS is not None:
+            credentials2 = _SHARED_CREDENTIALS
 
-            if exists(credentials2):
+            cr2stat: Optional[os.stat_result] = _stat_or_none(credentials2)
+            if cr2stat is not None:
                 logger.debug(f"{credentials2} EXISTS -> checking if newer than {credentials}")
 
-                crstat: int = int(os.stat(credentials).st_mtime)
-                cr2stat: int = int(os.stat(credentials2).st_mtime)
+                # integer ns -> no float rounding, changes within the same second are seen too
+                if cr2stat.st_mtime_ns > crstat.st_mtime_ns:
+                    netatmo_data2: dict = _read_credentials_cached(credentials2, cr2stat)
 
-                if cr2stat > crstat:
-                    logger.debug(
-                        f"{credentials2} ({datetime.datetime.fromtimestamp(cr2stat)}) NEWER THAN {credentials} ({datetime.datetime.fromtimestamp(crstat)}) -> OVERWRITING"
-                    )
+                    # the shared copy is (re)written right after every job -> it is usually newer by a few ms but
+                    # identical; only overwrite if it actually carries something else
+                    if netatmo_data2 != netatmo_data:
+                        logger.debug(
+                            f"{credentials2} ({datetime.datetime.fromtimestamp(cr2stat.st_mtime)}) NEWER THAN {credentials} ({datetime.datetime.fromtimestamp(crstat.st_mtime)}) -> OVERWRITING"
+                        )
 
-                    with open(credentials2, "r") as fin2:
-                        netatmo_data = json.load(fin2)
+                        netatmo_data = netatmo_data2
                         # if "ACCESS_TOKEN" not in netatmo_data and os.getenv("_NETATMO_ACCESS_TOKEN"):
                         #     netatmo_data["ACCESS_TOKEN"] = os.environ["_NETATMO_ACCESS_TOKEN"]
 
-                    with open(credentials, "w") as f:
-                        f.write(json.dumps(netatmo_data, indent=True))
+                        _write_credentials(credentials, netatmo_data)
     else:
         logger.debug(f"{credentials} DOES NOT exist -> setting netatmo_data from config")
         netatmo_data["CLIENT_ID"] = os.getenv("_NETATMO_CLIENT_ID")
@@ -247,23 +283,22 @@ def ensure_up2date_netatmo_credentialsfile() -> dict:
         netatmo_data["REFRESH_TOKEN"] = os.getenv("_NETATMO_REFRESH_TOKEN")
 
         logger.debug("netatmo_data from ENV:")
-        logger.debug(json.dumps(netatmo_data, indent=True))
+        logger.opt(lazy=True).debug("{}", lambda: json.dumps(netatmo_data, indent=True))
 
-        if os.getenv("STORAGEPATH"):
-            credentials2 = os.environ["STORAGEPATH"] + "/netatmo.credentials"
+        if _SHARED_CREDENTIALS is not None:
+            credentials2 = _SHARED_CREDENTIALS
 
-            if exists(credentials2):
+            cr2stat_init: Optional[os.stat_result] = _stat_or_none(credentials2)
+            if cr2stat_init is not None:
                 logger.debug(f"{credentials2} EXISTS -> setting to netatmo_data")
-                with open(credentials2, "r") as fin2:
-                    netatmo_data = json.load(fin2)
+                netatmo_data = _read_credentials_cached(credentials2, cr2stat_init)
             else:
                 logger.debug(f"{credentials2} DOES NOT EXIST")
 
-        with open(credentials, "w") as f:
-            f.write(json.dumps(netatmo_data, indent=True))
+        _write_credentials(credentials, netatmo_data)
 
     logger.debug("actual netatmo_data now:")
-    logger.debug(json.dumps(netatmo_data, indent=True))
+    logger.opt(lazy=True).debug("{}", lambda: json.dumps(netatmo_data, indent=True))
 
     return netatmo_data
 
@@ -275,14 +310,34 @@ ensure_up2date_netatmo_credentialsfile()
 
 import netatmostuff.lnetatmo as lnetatmo
 
+# kept across job ticks -> ClientAuth.accessToken only renews (HTTP roundtrip) when the access token is about to expire
+_AUTH: Optional[lnetatmo.ClientAuth] = None
+
+
+def _client_auth(netatmo_data: dict) -> lnetatmo.ClientAuth:
+    global _AUTH
+
+    # a different refresh token on disk (e.g. taken over from the shared STORAGEPATH copy) invalidates ours;
+    # a refresh done by _AUTH itself is written to the credentials file by lnetatmo and thus matches
+    if _AUTH is None or _AUTH.refreshToken != netatmo_data.get("REFRESH_TOKEN"):
+        logger.debug("Crontanamo::_client_auth::creating new ClientAuth")
+        _AUTH = lnetatmo.ClientAuth(credentialFile=_CREDENTIALS_PATH)
+
+    return _AUTH
+
+
+def _floor_minute(ts: int) -> datetime.datetime:
+    # truncate on the epoch value -> one datetime instead of fromtimestamp + astimezone + replace (3 objects);
+    # utc offsets are whole minutes, so this is the same as .replace(second=0, microsecond=0) on the local time
+    return datetime.datetime.fromtimestamp(ts - ts % 60, tz=_tzberlin)
+
 
 def job(mqttclient: MosquittoClientWrapper) -> None:
     # Example: USERNAME and PASSWORD supposed to be defined by one of the previous methods
 
-    ensure_up2date_netatmo_credentialsfile()
+    netatmo_data: dict = ensure_up2date_netatmo_credentialsfile()
 
-    personal_credfile: Path = Path(expanduser("~/.netatmo.credentials"))
-    auth_data = lnetatmo.ClientAuth(credentialFile=personal_credfile)
+    auth_data = _client_auth(netatmo_data)
     #     clientId=os.environ.get("NETATMO_CLIENT_ID"),
     #     clientSecret=os.environ.get("NETATMO_CLIENT_SECRET"),
     #     refreshToken=refreshToken,
@@ -293,43 +348,38 @@ def job(mqttclient: MosquittoClientWrapper) -> None:
     logger.debug(f"{type(weather_data)=}")
     # weather_data.getMeasure()
 
-    if weather_data is not None and weather_data.rawDataPostRequest is not None:
-        logger.debug(f"** RAW DATA {type(weather_data.rawDataPostRequest)=} **")
-        if isinstance(weather_data.rawDataPostRequest, bytes):
-            logger.debug(
-                Helper.get_pretty_dict_json_no_sort(json.loads(weather_data.rawDataPostRequest.decode("utf-8")))
-            )
-        elif isinstance(weather_data.rawDataPostRequest, str):
-            logger.debug(Helper.get_pretty_dict_json_no_sort(json.loads(weather_data.rawDataPostRequest)))
-        elif isinstance(weather_data.rawDataPostRequest, dict) or isinstance(weather_data.rawDataPostRequest, list):
-            logger.debug(Helper.get_pretty_dict_json_no_sort(weather_data.rawDataPostRequest))
+    if NETATMO_FULL_DUMP and weather_data is not None and weather_data.rawDataPostRequest is not None:
+        raw: Any = weather_data.rawDataPostRequest
+        logger.debug(f"** RAW DATA {type(raw)=} **")
+        if isinstance(raw, (bytes, str)):
+            # lnetatmo.postRequest only hands back raw data if the response was NOT application/json -> log it
+            # verbatim instead of a parse + re-serialize roundtrip just for the dump (which would fail for non-json)
+            logger.debug(raw)
+        elif isinstance(raw, dict) or isinstance(raw, list):
+            # lazy -> pretty-printing only happens if a DEBUG sink is active
+            logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(raw))
 
         logger.debug("/** RAW DATA **")
 
     station = weather_data.getStation()
     logger.debug(f"{type(station)=}")
-    if station is not None:
-        logger.debug(Helper.get_pretty_dict_json_no_sort(station))
+    if NETATMO_FULL_DUMP and station is not None:
+        logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(station))
 
     if not "dashboard_data" in station:
         logger.debug(f"NO DASHBOARD_DATA IN STATION!!!")
     else:
         logger.debug(f"DASHBOARD_DATA IN STATION!!!")
-        logger.debug(Helper.get_pretty_dict_json_no_sort(station["dashboard_data"]))
-
-    for hn, home in weather_data.homes.items():
-        logger.debug(f"Home {hn}:")
-        logger.debug(home)
+        if NETATMO_FULL_DUMP:
+            logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(station["dashboard_data"]))
 
-    for sn, stationme in weather_data.stations.items():
-        logger.debug(f"Station {sn}:")
-        logger.debug(stationme)
+    # home_name -> station_name only; the full per-station dicts are part of the NETATMO_FULL_DUMP above
+    logger.debug(f"{weather_data.homes=}")
 
     relative_pressure: float = station["dashboard_data"]["Pressure"]
     absolute_pressure: float = station["dashboard_data"]["AbsolutePressure"]
     pressure_t: int = station["dashboard_data"]["time_utc"]
-    pressure_tempdt: datetime.datetime = datetime.datetime.fromtimestamp(pressure_t, tz=pytz.UTC).astimezone(_tzberlin)
-    pressure_tempdt = pressure_tempdt.replace(second=0, microsecond=0)
+    pressure_tempdt: datetime.datetime = _floor_minute(pressure_t)
     logger.debug(f"Absolute Pressure: {absolute_pressure} {pressure_t=} {pressure_tempdt=}")
     logger.debug(f"Relative Pressure: {relative_pressure} {pressure_t=} {pressure_tempdt=}")
 
@@ -337,24 +387,18 @@ def job(mqttclient: MosquittoClientWrapper) -> None:
     # print(f"{weather_data.homes=}")
     # print(f"{weather_data.modulesNamesList(station=station['station_name'])=}")
 
-    aussen: Optional[dict] = None
-    regen: Optional[dict] = None
-    for n in weather_data.modulesNamesList(station=station["station_name"]):
-        mod: dict = weather_data.moduleByName(n)
-        logger.debug(f"{n} => {type(mod)=}")
-        if not mod:
-            logger.debug(f"EMPTY MOD (for {n}) !!!")
-            continue
+    # one pass over the station's modules -> two direct lookups instead of comparing name + id of every module
+    station_modules: List[dict] = station.get("modules", [])
+    modules_by_id: Dict[str, dict] = {m["_id"]: m for m in station_modules}
+    modules_by_name: Dict[str, dict] = {m["module_name"]: m for m in station_modules}
+    logger.debug(f"modules: {list(modules_by_name.keys())}")
 
-        logger.debug(Helper.get_pretty_dict_json_no_sort(mod))
-        if n == settings.netatmo.outdoormodule.name or (
-            mod is not None and mod["_id"] == str(settings.netatmo.outdoormodule.id)
-        ):
-            aussen = mod
-        if n == settings.netatmo.rainmodule.name or (
-            mod is not None and mod["_id"] == str(settings.netatmo.rainmodule.id)
-        ):
-            regen = mod
+    aussen: Optional[dict] = modules_by_name.get(settings.netatmo.outdoormodule.name) or modules_by_id.get(
+        str(settings.netatmo.outdoormodule.id)
+    )
+    regen: Optional[dict] = modules_by_name.get(settings.netatmo.rainmodule.name) or modules_by_id.get(
+        str(settings.netatmo.rainmodule.id)
+    )
 
     if not aussen:
         raise Exception("AUSSEN MODULE NOT FOUND")
@@ -362,11 +406,12 @@ def job(mqttclient: MosquittoClientWrapper) -> None:
     if not regen:
         raise Exception("REGEN MODULE NOT FOUND")
 
-    logger.debug("AUSSEN:")
-    logger.debug(Helper.get_pretty_dict_json_no_sort(aussen))
+    if NETATMO_FULL_DUMP:
+        logger.debug("AUSSEN:")
+        logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(aussen))
 
-    logger.debug("REGEN:")
-    logger.debug(Helper.get_pretty_dict_json_no_sort(regen))
+        logger.debug("REGEN:")
+        logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(regen))
 
     if not "dashboard_data" in aussen:
         raise Exception("NO DASHBOARD DATA IN AUSSEN-MODULE FOUND")
@@ -436,26 +481,26 @@ def job(mqttclient: MosquittoClientWrapper) -> None:
     # except Exception as exx:
     #     logger.opt(exception=exx).exception(exx)
 
-    before_one_hour = datetime.datetime.now(tz=_tzberlin) - timedelta(hours=1)  # midpoint of now -1h
+    now_berlin: datetime.datetime = datetime.datetime.now(tz=_tzberlin)
+
+    before_one_hour = now_berlin - timedelta(hours=1)  # midpoint of now -1h
     before_one_hour = before_one_hour.replace(minute=30, second=0, microsecond=0)
     logger.debug(f"{type(before_one_hour)=} {before_one_hour=}")
 
-    before_24_hours = datetime.datetime.now(tz=_tzberlin) - timedelta(hours=12)  # midpoint of now -24h
+    before_24_hours = now_berlin - timedelta(hours=12)  # midpoint of now -24h
     before_24_hours = before_24_hours.replace(minute=0, second=0, microsecond=0)
     logger.debug(f"{type(before_24_hours)=} {before_24_hours=}")
 
     cur_temp: float = aussen["dashboard_data"]["Temperature"]  # type: ignore
     aussen_t: int = aussen["dashboard_data"]["time_utc"]  # type: ignore
-    aussen_tempdt: datetime.datetime = datetime.datetime.fromtimestamp(aussen_t, tz=pytz.UTC).astimezone(_tzberlin)
-    aussen_tempdt = aussen_tempdt.replace(second=0, microsecond=0)
+    aussen_tempdt: datetime.datetime = _floor_minute(aussen_t)
     logger.debug(f"Current Temperature: {cur_temp} {aussen_t=} {aussen_tempdt=}")
 
     rain: float = regen["dashboard_data"]["Rain"]  # type: ignore
     rain_sum_1: float = regen["dashboard_data"]["sum_rain_1"]  # type: ignore
     rain_sum_24: float = regen["dashboard_data"]["sum_rain_24"]  # type: ignore
     rain_t: int = regen["dashboard_data"]["time_utc"]  # type: ignore
-    rain_tempdt: datetime.datetime = datetime.datetime.fromtimestamp(rain_t, tz=pytz.UTC).astimezone(_tzberlin)
-    rain_tempdt = rain_tempdt.replace(second=0, microsecond=0)
+    rain_tempdt: datetime.datetime = _floor_minute(rain_t)
 
     logger.debug(f"Current Rain: {rain=} {rain_sum_1=} {rain_sum_24=} {rain_t=} {rain_tempdt=}")
 
@@ -500,6 +545,10 @@ def job(mqttclient: MosquittoClientWrapper) -> None:
     #     )
 
 
+# account/scope problems -> retrying within the same run will not change anything
+_PERMANENT_NETATMO_ERRORS: Tuple[type[Exception], ...] = (lnetatmo.NoDevice, lnetatmo.NoHome, lnetatmo.OutOfScope)
+
+
 def exc_caught_job_loop(mqttclient: MosquittoClientWrapper, maxtries: int = 10) -> int:
     for i in range(0, maxtries):
         try:
@@ -509,11 +558,17 @@ def exc_caught_job_loop(mqttclient: MosquittoClientWrapper, maxtries: int = 10)
             write_netatmo_credentials_to_shared_file()
 
             return 0
+        except _PERMANENT_NETATMO_ERRORS as ex:
+            logger.opt(exception=ex).exception(ex)
+            return 1
         except Exception as ex:
             # logger.exception(Helper.get_exception_tb_as_string(ex))
             # Helper.eprint(Helper.getExceptionTBAsString(ex))
             logger.opt(exception=ex).exception(ex)
-            time.sleep(2)
+            if i + 1 < maxtries:
+                # exponential backoff (0.5s, 1s, 2s, ... capped at 30s) + jitter -> short glitches recover faster,
+                # longer outages are not hammered every 2s
+                time.sleep(min(30.0, (2**i) * 0.5) + random.random() * 0.25)
 
     return 1
 
@@ -521,7 +576,7 @@ def exc_caught_job_loop(mqttclient: MosquittoClientWrapper, maxtries: int = 10)
 def run_test_netatmo() -> None:
     ensure_up2date_netatmo_credentialsfile()
 
-    auth_data = lnetatmo.ClientAuth(credentialFile=Path(expanduser("~/.netatmo.credentials")))
+    auth_data = lnetatmo.ClientAuth(credentialFile=_CREDENTIALS_PATH)
     #     clientId=os.environ.get("NETATMO_CLIENT_ID"),
     #     clientSecret=os.environ.get("NETATMO_CLIENT_SECRET"),
     #     refreshToken=refreshToken,
@@ -532,12 +587,11 @@ def run_test_netatmo() -> None:
     station = weather_data.getStation()
 
     logger.debug(f"{type(station)=}")
-    logger.debug(Helper.get_pretty_dict_json_no_sort(station))
+    logger.opt(lazy=True).debug("{}", lambda: Helper.get_pretty_dict_json_no_sort(station))
 
 
 def main() -> int:
     schedulexseconds: int = 300
-    sleeptimexseconds: int = 10
 
     mqttclient: MosquittoClientWrapper = MosquittoClientWrapper(
         host=settings.mqtt.host,
@@ -557,17 +611,21 @@ def main() -> int:
     ret: int = exc_caught_job_loop(mqttclient=mqttclient, maxtries=10)
 
     if len(sys.argv) > 1 and not sys.argv[1] == "shootonce":
-        if len(sys.argv) == 3:
+        # a trailing sleeptimexseconds argument (former polling interval) is still accepted, but not needed anymore
+        if len(sys.argv) >= 3:
             schedulexseconds = int(sys.argv[2])
-            sleeptimexseconds = int(sys.argv[3])
 
-        logger.info(f"{schedulexseconds=} {sleeptimexseconds=}")
-
-        schedule.every(schedulexseconds).seconds.do(exc_caught_job_loop, mqttclient=mqttclient, maxtries=10)
+        logger.info(f"{schedulexseconds=}")
 
+        # single job -> a monotonic deadline instead of the schedule lib (wall-clock based, scans its job list on
+        # every run_pending()); immune to clock jumps/NTP steps
+        next_run: float = time.monotonic() + schedulexseconds
         while True:
-            run_pending()
-            time.sleep(sleeptimexseconds)
+            time.sleep(max(0.0, next_run - time.monotonic()))
+
+            now: float = time.monotonic()
+            exc_caught_job_loop(mqttclient=mqttclient, maxtries=10)
+            next_run = now + schedulexseconds
     else:
         exit(ret)
 
@@ -27,7 +27,10 @@ possibly acting on an outdated retained board.
 
 Serialization note: mqttstuff's ``publish_one`` only wraps ``dict`` values (via
 ``json.dumps``); this bridge therefore always publishes a ``dict``, never a
-bare list.
+bare list. The per-cycle fan-out (:meth:`GtfsMqttBridge.publish_cycle`,
+:meth:`GtfsMqttBridge.publish_departures`) serializes the same way itself and
+hands all messages to paho before waiting for any of them (see
+:meth:`GtfsMqttBridge._safe_publish_many`).
 
 TLS: passed natively to ``mqttstuff`` (>= 0.0.6) — server auth via CA
 (``None`` = system CA store), optional mutual TLS (client cert + key), optional
@@ -36,11 +39,13 @@ option combination and raises ``ValueError`` on inconsistencies.
 """
 
 import datetime
+import json
 import logging
 import re
 import unicodedata
 
 from mqttstuff import MosquittoClientWrapper
+from paho.mqtt.client import MQTTMessageInfo
 
 from oepnvstuff.gtfs_realtime import ServiceAlert
 from oepnvstuff.monitor import CycleResult, LineStatus, NextDeparture, RealtimeMonitor
@@ -246,11 +251,12 @@ class GtfsMqttBridge:
             "lines_with_realtime": sum(1 for s in cycle.per_line.values() if s.has_realtime),
             "lines_total": len(cycle.per_line),
         }
-        self._safe_publish(f"{self._base}/status", summary, retain=False)
-        for status in cycle.per_line.values():
-            self._safe_publish(
-                f"{self._base}/lines/{_mqtt_safe(status.line)}/status", _line_payload(status), retain=False
-            )
+        messages: list[tuple[str, dict[str, object]]] = [(f"{self._base}/status", summary)]
+        messages.extend(
+            (f"{self._base}/lines/{_mqtt_safe(status.line)}/status", _line_payload(status))
+            for status in cycle.per_line.values()
+        )
+        self._safe_publish_many(messages, retain=False)
 
     def publish_alert(self, alert: ServiceAlert) -> None:
         """AlertHandler: publish one new service alert to ``<base>/alerts``.
@@ -334,7 +340,7 @@ class GtfsMqttBridge:
                 for nd in cycle.next_departures
             ],
         }
-        self._safe_publish(f"{self._base}/departures", payload, retain=False)
+        messages: list[tuple[str, dict[str, object]]] = [(f"{self._base}/departures", payload)]
 
         groups: dict[tuple[str, str, str], list[NextDeparture]] = {}
         for nd in cycle.next_departures:
@@ -348,7 +354,8 @@ class GtfsMqttBridge:
                 "direction": direction,
                 "departures": [self._departure_entry(nd, cycle.wall_time) for nd in nds],
             }
-            self._safe_publish(topic, group_payload, retain=False)
+            messages.append((topic, group_payload))
+        self._safe_publish_many(messages, retain=False)
 
     def _safe_publish(self, topic: str, payload: dict[str, object], *, retain: bool) -> None:
         """Publish ``payload`` (always a dict → JSON), swallowing broker errors.
@@ -369,6 +376,39 @@ class GtfsMqttBridge:
         except Exception:
             logger.exception(f"MQTT publish to {topic} failed")
 
+    def _safe_publish_many(self, messages: list[tuple[str, dict[str, object]]], *, retain: bool) -> None:
+        """Publish all ``messages`` first, then wait for each, swallowing broker errors.
+
+        ``publish_one`` waits for every message before the next one is even
+        queued, so a cycle's fan-out (status + one message per line/group)
+        costs one paho network-thread handoff per message. Queueing all of them
+        first lets paho write them back to back. Serialization matches
+        ``publish_one`` for a ``dict`` value without metadata
+        (``json.dumps(payload, default=str)``, QoS 0).
+
+        Args:
+            messages: ``(topic, payload)`` pairs, published in order.
+            retain: Whether the broker should keep the messages as last value
+                (this bridge always publishes ``False`` — see module docstring).
+        """
+        client = self._mq.client
+        if client is None:
+            logger.error(f"MQTT publish of {len(messages)} messages failed: no client")
+            return
+
+        pending: list[tuple[str, MQTTMessageInfo]] = []
+        for topic, payload in messages:
+            try:
+                pending.append((topic, client.publish(topic, json.dumps(payload, default=str), qos=0, retain=retain)))
+            except Exception:
+                logger.exception(f"MQTT publish to {topic} failed")
+
+        for topic, info in pending:
+            try:
+                info.wait_for_publish()
+            except Exception as exc:
+                logger.warning(f"MQTT publish to {topic} not confirmed: {type(exc).__name__}: {exc}")
+
 
 def attach_bridge(monitor: RealtimeMonitor, bridge: GtfsMqttBridge) -> None:
     """Convenience wiring: hook a :class:`GtfsMqttBridge` onto a monitor.
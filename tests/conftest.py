@@ -1,5 +1,38 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
 import pytest
 
+# the repo's config.yaml is only a template (it does not validate on its own) -> complete it with a test overlay,
+# unless the caller points to a local config explicitly
+os.environ.setdefault("SOMESTUFF_CONFIG_LOCAL_PATH", str(Path(__file__).parent / "config.test.yaml"))
+
+_ORIG_HOME: str | None = None
+_TEST_HOME: str | None = None
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # some modules write into ~ at import (e.g. netatmostuff.Crontanamo -> ~/.netatmo.credentials) -> never the real
+    # home; a hook instead of a (session-)fixture: test modules are imported during collection, before any fixture
+    global _ORIG_HOME, _TEST_HOME
+    _ORIG_HOME = os.environ.get("HOME")
+    _TEST_HOME = tempfile.mkdtemp(prefix="somestuff-tests-home-")
+    os.environ["HOME"] = _TEST_HOME
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    if _TEST_HOME is None:
+        return
+
+    if _ORIG_HOME is None:
+        os.environ.pop("HOME", None)
+    else:
+        os.environ["HOME"] = _ORIG_HOME
+    shutil.rmtree(_TEST_HOME, ignore_errors=True)
+
+
 # @pytest.fixture()
 # def gapp():  # type: ignore
 #     def efun() -> Response:
@@ -0,0 +1,62 @@
+"""Tests for config: yaml settings-source, settings fingerprint and the (opt-in) pickled settings cache."""
+
+from pathlib import Path
+
+import pytest
+from pydantic_settings import YamlConfigSettingsSource
+
+import config
+
+
+def test_csafe_yaml_source_matches_pydantic_settings_yaml_source() -> None:
+    # same files, same merge (config.yaml overlaid by the local config) as the stock source -> only the loader differs
+    yaml_files: list[Path] = [config._CONFIGPATH, config._CONFIGLOCALPATH]
+    ours: dict = config.CSafeYamlConfigSettingsSource(config.Settings, yaml_files)()
+    assert ours == YamlConfigSettingsSource(config.Settings, yaml_file=yaml_files, yaml_file_encoding="utf-8")()
+    assert ours["hydromail"]["mailfrom"].endswith("@example.com")  # from the local overlay
+    assert ours["mqtt"]["port"] == 1883  # from config.yaml
+
+
+def test_settings_fingerprint_changes_with_env_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    before: str = config._settings_fingerprint()
+    assert config._settings_fingerprint() == before
+
+    # nested override of a settings-field (case-insensitive, "__"-delimited)
+    monkeypatch.setenv("MQTT__HOST", "10.9.8.7")
+    overridden: str = config._settings_fingerprint()
+    assert overridden != before
+
+    monkeypatch.setenv("MQTT__HOST", "10.9.8.8")
+    assert config._settings_fingerprint() != overridden
+
+    monkeypatch.delenv("MQTT__HOST")
+    assert config._settings_fingerprint() == before
+
+
+def test_settings_fingerprint_ignores_unrelated_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    before: str = config._settings_fingerprint()
+    monkeypatch.setenv("SOMETHING_UNRELATED", "x")
+    assert config._settings_fingerprint() == before
+
+
+def test_settings_cache_is_opt_in(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    cachepath: Path = tmp_path / "settings.pkl"
+    monkeypatch.setattr(config, "_SETTINGSCACHEPATH", cachepath)
+
+    monkeypatch.delenv("SOMESTUFF_SETTINGS_CACHE", raising=False)
+    assert isinstance(config._load_settings(), config.Settings)
+    assert not cachepath.exists()
+
+    monkeypatch.setenv("SOMESTUFF_SETTINGS_CACHE", "True")
+    first: config.Settings = config._load_settings()
+    assert cachepath.exists()
+    written: tuple[int, bytes] = (cachepath.stat().st_mtime_ns, cachepath.read_bytes())
+
+    # unpickling does not run __init__ -> any rebuild of Settings() would raise here
+    def no_rebuild(self: config.Settings, **kwargs: object) -> None:
+        raise AssertionError("Settings() rebuilt instead of loaded from the cache")
+
+    monkeypatch.setattr(config.Settings, "__init__", no_rebuild)
+    cached: config.Settings = config._load_settings()
+    assert cached == first and cached is not first
+    assert (cachepath.stat().st_mtime_ns, cachepath.read_bytes()) == written
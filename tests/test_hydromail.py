@@ -0,0 +1,67 @@
+"""Tests for hydromailstuff: the netatmo rain-measure window and its today/yesterday split."""
+
+import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+try:
+    from hydromailstuff.hydromail import _measure_window
+except Exception as ex:  # reputils 0.0.16 fails to import on some interpreters -> nothing to test against then
+    pytest.skip(f"hydromailstuff not importable: {ex!r}", allow_module_level=True)
+
+BERLIN = ZoneInfo("Europe/Berlin")
+
+
+def _dt(*args: int, fold: int = 0) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=BERLIN, fold=fold)  # type: ignore[arg-type,misc]
+
+
+def test_measure_window_just_after_midnight() -> None:
+    begin, end, today_start_ts = _measure_window(_dt(2026, 7, 15, 0, 5))
+
+    assert begin == _dt(2026, 7, 14, 0, 0)
+    assert end == _dt(2026, 7, 14, 23, 59, 59, 999_999)
+    assert today_start_ts == _dt(2026, 7, 15, 0, 0).timestamp()
+
+    # 23:00 measure of yesterday is "yesterday", the (future) 00:00 one would be "today"
+    assert _dt(2026, 7, 14, 23, 0).timestamp() < today_start_ts
+    assert _dt(2026, 7, 15, 0, 0).timestamp() >= today_start_ts
+
+
+def test_measure_window_first_of_month() -> None:
+    begin, end, today_start_ts = _measure_window(_dt(2026, 3, 1, 0, 5))
+
+    assert begin == _dt(2026, 2, 28, 0, 0)
+    assert end == _dt(2026, 2, 28, 23, 59, 59, 999_999)
+    assert today_start_ts == _dt(2026, 3, 1, 0, 0).timestamp()
+
+    begin, end, _ = _measure_window(_dt(2026, 1, 1, 10, 30))
+    assert begin == _dt(2025, 12, 31, 0, 0)
+    assert end == _dt(2026, 1, 1, 9, 59, 59, 999_999)
+
+
+def test_measure_window_dst_spring_forward() -> None:
+    # 2026-03-29: 02:00 CET -> 03:00 CEST; the hour before 03:10 CEST is 01:xx CET (02:xx does not exist)
+    begin, end, today_start_ts = _measure_window(_dt(2026, 3, 29, 3, 10))
+
+    assert begin == _dt(2026, 3, 28, 0, 0)
+    assert end == _dt(2026, 3, 29, 1, 59, 59, 999_999)
+    assert end.utcoffset() == datetime.timedelta(hours=1)
+    assert end < _dt(2026, 3, 29, 3, 10)
+    assert today_start_ts == _dt(2026, 3, 29, 0, 0).timestamp()
+
+    # day after the switch: yesterday 00:00 still is CET, today 00:00 is CEST -> 23h "yesterday"
+    begin, _, today_start_ts = _measure_window(_dt(2026, 3, 30, 0, 5))
+    assert begin.utcoffset() == datetime.timedelta(hours=1)
+    assert today_start_ts - begin.timestamp() == 23 * 3600
+
+
+def test_measure_window_dst_fall_back() -> None:
+    # 2026-10-25: 03:00 CEST -> 02:00 CET; 02:30 occurs twice
+    _, end, _ = _measure_window(_dt(2026, 10, 25, 2, 30, fold=1))
+    assert end.utcoffset() == datetime.timedelta(hours=2)
+    assert end == _dt(2026, 10, 25, 2, 59, 59, 999_999, fold=0)
+
+    begin, _, today_start_ts = _measure_window(_dt(2026, 10, 26, 0, 5))
+    assert today_start_ts - begin.timestamp() == 25 * 3600
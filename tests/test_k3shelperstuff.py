@@ -0,0 +1,82 @@
+"""Tests for k3shelperstuff: kubeconfig parsing and credential comparison."""
+
+import json
+
+from k3shelperstuff.update_local_k3s_keys import compare_credentials, parse_kubeconfig
+
+KUBECONFIG: dict = {
+    "apiVersion": "v1",
+    "kind": "Config",
+    "clusters": [
+        {"name": "default", "cluster": {"server": "https://127.0.0.1:6443", "certificate-authority-data": "Q0E="}}
+    ],
+    "users": [{"name": "default", "user": {"client-certificate-data": "Q0VSVA==", "client-key-data": "S0VZ"}}],
+    "contexts": [{"name": "default", "context": {"cluster": "default", "user": "default"}}],
+    "current-context": "default",
+}
+
+KUBECONFIG_YAML: str = """apiVersion: v1
+kind: Config
+clusters:
+- name: default
+  cluster:
+    server: https://127.0.0.1:6443
+    certificate-authority-data: Q0E=
+users:
+- name: default
+  user:
+    client-certificate-data: Q0VSVA==
+    client-key-data: S0VZ
+contexts:
+- name: default
+  context:
+    cluster: default
+    user: default
+current-context: default
+"""
+
+
+def test_parse_kubeconfig_yaml() -> None:
+    assert parse_kubeconfig(KUBECONFIG_YAML) == KUBECONFIG
+    assert parse_kubeconfig(KUBECONFIG_YAML.encode()) == KUBECONFIG
+
+
+def test_parse_kubeconfig_json() -> None:
+    raw: str = json.dumps(KUBECONFIG, indent=2)
+    assert parse_kubeconfig(raw) == KUBECONFIG
+    assert parse_kubeconfig(b"\n  " + raw.encode()) == KUBECONFIG
+
+
+def test_parse_kubeconfig_flow_yaml_starting_with_brace() -> None:
+    # starts with '{' but is no valid json -> falls through to the yaml loader
+    assert parse_kubeconfig("{apiVersion: v1, kind: Config}") == {"apiVersion": "v1", "kind": "Config"}
+
+
+def test_parse_kubeconfig_empty() -> None:
+    assert parse_kubeconfig("") == {}
+    assert parse_kubeconfig(b"   \n") == {}
+    assert parse_kubeconfig("{}") == {}
+    assert parse_kubeconfig("null") == {}
+
+
+def test_compare_credentials_identical() -> None:
+    creds: dict = KUBECONFIG["users"][0]["user"]
+    assert compare_credentials(creds, dict(creds), "Q0E=", "Q0E=") == {}
+
+
+def test_compare_credentials_diff() -> None:
+    remote: dict = {"client-certificate-data": "R" * 60, "client-key-data": "S0VZ"}
+    local: dict = {"client-certificate-data": "L" * 60, "client-key-data": "S0VZ"}
+
+    assert compare_credentials(remote, local, "Q0E=", None) == {
+        "client-certificate-data": {"remote": "R" * 50 + "...", "local": "L" * 50 + "..."},
+        "certificate-authority-data": {"remote": "Q0E=...", "local": None},
+    }
+
+
+def test_compare_credentials_missing_local() -> None:
+    remote: dict = KUBECONFIG["users"][0]["user"]
+
+    diff: dict = compare_credentials(remote, {}, "Q0E=", "Q0E=")
+    assert list(diff) == ["client-certificate-data", "client-key-data"]
+    assert diff["client-key-data"] == {"remote": "S0VZ...", "local": None}
@@ -0,0 +1,100 @@
+"""Tests for llmstuff.llmhelper: schema validation of single and batch results."""
+
+from types import SimpleNamespace
+from typing import Any, List
+
+import google.genai.types as gtypes
+import pytest
+from pydantic import BaseModel
+
+import llmstuff.llmhelper as llmhelper
+from llmstuff.llmhelper import AIRequest
+
+
+class Item(BaseModel):
+    name: str
+    count: int
+
+
+def _response(text: str) -> gtypes.GenerateContentResponse:
+    return gtypes.GenerateContentResponse(
+        candidates=[gtypes.Candidate(content=gtypes.Content(role="model", parts=[gtypes.Part(text=text)]))]
+    )
+
+
+class _FakeBatches:
+    """Stands in for ``client.batches``: the job is finished on the first poll."""
+
+    def __init__(self, inlined_responses: List[gtypes.InlinedResponse]) -> None:
+        self._job = gtypes.BatchJob(
+            name="batches/test",
+            state=gtypes.JobState.JOB_STATE_SUCCEEDED,
+            dest=gtypes.BatchJobDestination(inlined_responses=inlined_responses),
+        )
+        self.created_with: dict[str, Any] = {}
+
+    def create(self, **kwargs: Any) -> gtypes.BatchJob:
+        self.created_with = kwargs
+        return gtypes.BatchJob(name="batches/test", state=gtypes.JobState.JOB_STATE_PENDING)
+
+    def get(self, name: str) -> gtypes.BatchJob:
+        assert name == "batches/test"
+        return self._job
+
+
+def test_request_ai_batch_keeps_results_on_schema_mismatch(monkeypatch: pytest.MonkeyPatch) -> None:
+    batches = _FakeBatches(
+        [
+            gtypes.InlinedResponse(response=_response('{"name": "banana", "count": 3}')),
+            gtypes.InlinedResponse(response=_response('{"name": "apple", "cou')),  # truncated
+            gtypes.InlinedResponse(response=_response('{"title": "not the schema"}')),
+            gtypes.InlinedResponse(error=gtypes.JobError(code=500, message="boom")),
+            gtypes.InlinedResponse(response=_response("plain text")),
+        ]
+    )
+    monkeypatch.setattr(llmhelper, "_create_gemini_client", lambda retries=None: SimpleNamespace(batches=batches))
+
+    requests: List[AIRequest[Any]] = [AIRequest(prompt=f"p{i}", response_schema=Item) for i in range(4)]
+    requests.append(AIRequest(prompt="p4"))
+
+    results = llmhelper.request_ai_batch(requests)
+
+    assert len(batches.created_with["src"]) == 5
+    assert [r[0] for r in results] == [
+        Item(name="banana", count=3),
+        '{"name": "apple", "cou',
+        '{"title": "not the schema"}',
+        None,
+        "plain text",
+    ]
+    assert results[1][2] is not None and results[2][2] is not None
+    assert results[3] == (None, None, None)
+
+
+def _fake_generate(monkeypatch: pytest.MonkeyPatch, response: gtypes.GenerateContentResponse) -> None:
+    models = SimpleNamespace(generate_content=lambda **kwargs: response)
+    monkeypatch.setattr(
+        llmhelper,
+        "_create_gemini_client",
+        lambda debug_with_replayid=None, retries=None: SimpleNamespace(models=models),
+    )
+
+
+def test_request_gemini_validates_parsed(monkeypatch: pytest.MonkeyPatch) -> None:
+    response = _response('{"name": "banana", "count": 3}')
+    response.parsed = {"name": "banana", "count": 3}
+    _fake_generate(monkeypatch, response)
+
+    answer, _, raw = llmhelper.request_gemini(AIRequest(prompt="p", response_schema=Item))
+    assert answer == Item(name="banana", count=3)
+    assert raw is response
+
+
+def test_request_gemini_falls_back_to_text_on_schema_mismatch(monkeypatch: pytest.MonkeyPatch) -> None:
+    response = _response('{"title": "not the schema"}')
+    response.parsed = {"title": "not the schema"}
+    _fake_generate(monkeypatch, response)
+
+    answer, _, raw = llmhelper.request_gemini(AIRequest(prompt="p", response_schema=Item))
+    assert answer == '{"title": "not the schema"}'
+    assert raw is response
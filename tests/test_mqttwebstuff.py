@@ -70,6 +70,15 @@ def test_decode_payload() -> None:
     assert decode_payload('["x"]') == ["x"]
     assert decode_payload(b"{broken json") == "{broken json"
     assert decode_payload("plain text") == "plain text"
+    assert decode_payload(b" \n[1, 2]") == [1, 2]
+    assert decode_payload(b"21.5") == "21.5"
+    assert decode_payload(b"\xffplain") == "\ufffdplain"
+    assert decode_payload(b'\xef\xbb\xbf{"a": 1}') == {"a": 1}
+    assert decode_payload("\ufeff[1]") == [1]
+    assert decode_payload(b'\xc2\xa0{"a": 1}') == {"a": 1}
+    assert decode_payload(b"\xef\xbb\xbf21.5") == "\ufeff21.5"
+    assert decode_payload(b"\xef\xbb\xbf \r\n[1, 2]") == [1, 2]
+    assert decode_payload(b"\xc2\xa0 plain") == "\xa0 plain"
 
 
 def test_load_plugin_rejects_missing_contract(tmp_path: Path) -> None:
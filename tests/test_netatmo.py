@@ -0,0 +1,97 @@
+"""Tests for netatmostuff.Crontanamo: mqtt payload wire format, topic/qos mapping, minute-truncated timestamps."""
+
+import datetime
+import json
+from types import SimpleNamespace
+from typing import Any, List
+
+from loguru import logger
+from mqttstuff.mosquittomqttwrapper import MosquittoClientWrapper, MWMqttMessage
+
+from config import TIMEZONE
+from netatmostuff.Crontanamo import _floor_minute, _publish_all, _valuemsg_payload, send_to_mosquitto
+
+CREATED = datetime.datetime(2026, 7, 19, 19, 33, 6, 123456, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+METADATA = {"lat": 53.5, "lon": 10.0, "ele": 12.3}
+
+MSGS: List[MWMqttMessage] = [
+    MWMqttMessage(topic="t/temp", value=21.5, valuedt=CREATED, metadata=METADATA, qos=1, retained=True),
+    MWMqttMessage(topic="t/nometa", value=1013.2, valuedt=CREATED),
+    MWMqttMessage(topic="t/nodt", value="abc", metadata=METADATA),
+    MWMqttMessage(topic="t/dict", value={"a": 1, "when": CREATED}),
+    MWMqttMessage(topic="t/dictmeta", value={"a": 1}, valuedt=CREATED, metadata=METADATA),
+    MWMqttMessage(topic="t/none", value=None, valuedt=CREATED, metadata=METADATA),
+    MWMqttMessage(topic="t/emptymeta", value=7.0, valuedt=CREATED, metadata={}),
+]
+
+
+class _RecordingClient:
+    """Stands in for the paho client: records publish()-kwargs, acks immediately."""
+
+    def __init__(self) -> None:
+        self.published: List[dict[str, Any]] = []
+
+    def publish(self, **kwargs: Any) -> SimpleNamespace:
+        self.published.append(kwargs)
+        return SimpleNamespace(wait_for_publish=lambda timeout=None: None)
+
+
+def _wrapper_published(msgs: List[MWMqttMessage]) -> List[dict[str, Any]]:
+    client = _RecordingClient()
+    fake_self = SimpleNamespace(client=client, noisy_client=False, logger=logger)
+    assert MosquittoClientWrapper.publish_multiple(fake_self, msgs) == [True] * len(msgs)  # type: ignore[arg-type]
+    return client.published
+
+
+def test_publish_all_matches_wrapper_wire_format() -> None:
+    client = _RecordingClient()
+    assert _publish_all(SimpleNamespace(client=client), MSGS) == [True] * len(MSGS)  # type: ignore[arg-type]
+
+    assert client.published == _wrapper_published(MSGS)
+
+
+def test_valuemsg_payload_shape() -> None:
+    payload = _valuemsg_payload(MSGS[0])
+    assert isinstance(payload, str)
+    assert json.loads(payload) == {"value": 21.5, **METADATA, "created_at": "2026-07-19T19:33:06.123+02:00"}
+
+    assert _valuemsg_payload(MSGS[1]) == 1013.2
+    assert json.loads(_valuemsg_payload(MSGS[2])) == {"value": "abc", **METADATA}  # type: ignore[arg-type]
+    assert json.loads(_valuemsg_payload(MSGS[3])) == {"a": 1, "when": str(CREATED)}  # type: ignore[arg-type]
+    assert _valuemsg_payload(MSGS[5]) is None
+    assert _valuemsg_payload(MSGS[6]) == 7.0
+
+
+def test_send_to_mosquitto_uses_configured_topics_and_qos() -> None:
+    # the example config.yaml: temperature and 24h rain with qos 1, all others default to 0
+    client = _RecordingClient()
+    send_to_mosquitto(
+        SimpleNamespace(client=client),  # type: ignore[arg-type]
+        temp=21.5,
+        pressure=1013.2,
+        absolute_pressure=1001.0,
+        rain=0.1,
+        rain1h=0.4,
+        rain24h=3.2,
+    )
+
+    assert [(p["topic"], p["qos"], p["retain"]) for p in client.published] == [
+        ("netatmo/temperature", 1, True),
+        ("netatmo/rain", 0, True),
+        ("netatmo/rain1h", 0, True),
+        ("netatmo/rain24h", 1, True),
+        ("netatmo/pressure", 0, True),
+    ]
+
+
+def test_floor_minute_is_tz_aware_and_matches_replace() -> None:
+    # summer time, both passes of the fall-back hour (fold=0/1), after it, and around the spring-forward gap
+    for ts in (1784482386, 1792888259, 1792891859, 1792895459, 1774745999, 1774746059):
+        expected: datetime.datetime = datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc).astimezone(TIMEZONE)
+        expected = expected.replace(second=0, microsecond=0)
+
+        floored: datetime.datetime = _floor_minute(ts)
+        assert floored.tzinfo is TIMEZONE
+        assert floored.utcoffset() == expected.utcoffset()
+        assert (floored, floored.fold) == (expected, expected.fold)
+        assert floored.timestamp() == ts - ts % 60
@@ -0,0 +1,64 @@
+"""Tests for llmstuff.ollamadeepseekocr: early stop of the streamed json-generation."""
+
+import json
+from typing import Any, Iterator, List
+
+import pytest
+from ollama import GenerateResponse
+
+import llmstuff.ollamadeepseekocr as ocr
+
+
+class _FakeStream:
+    """Iterator over canned response-chunks; records how far it was consumed and whether it was closed."""
+
+    def __init__(self, chunks: List[str]) -> None:
+        self._chunks: Iterator[str] = iter(chunks)
+        self.consumed: int = 0
+        self.closed: bool = False
+
+    def __iter__(self) -> "_FakeStream":
+        return self
+
+    def __next__(self) -> GenerateResponse:
+        text: str = next(self._chunks)
+        self.consumed += 1
+        return GenerateResponse(model="m", response=text)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _generate_json(monkeypatch: pytest.MonkeyPatch, chunks: List[str]) -> tuple[str, _FakeStream]:
+    stream = _FakeStream(chunks)
+
+    def fake_generate(**kwargs: Any) -> _FakeStream:
+        assert kwargs["stream"] is True
+        return stream
+
+    monkeypatch.setattr(ocr.OLLAMA_CLIENT, "generate", fake_generate)
+    return ocr.generate_json(model="m", prompt="p"), stream
+
+
+def test_generate_json_ignores_braces_in_strings(monkeypatch: pytest.MonkeyPatch) -> None:
+    chunks: List[str] = ['{"explanation": "a {', ' and \\"}\\" ', 'and ]", "n": [1, {"x": "}"}]', "}", " trailing", "!"]
+    result, stream = _generate_json(monkeypatch, chunks)
+
+    assert json.loads(result) == {"explanation": 'a { and "}" and ]', "n": [1, {"x": "}"}]}
+    assert stream.consumed == 4  # stopped right at the closing brace -> trailing tokens never waited for
+    assert stream.closed
+
+
+def test_generate_json_escape_split_across_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    result, stream = _generate_json(monkeypatch, ['{"a": "x\\', '"}', '"}', " tail"])
+
+    assert json.loads(result) == {"a": 'x"}'}
+    assert stream.consumed == 3
+    assert stream.closed
+
+
+def test_generate_json_unterminated_returns_everything(monkeypatch: pytest.MonkeyPatch) -> None:
+    result, stream = _generate_json(monkeypatch, ['{"a": ', '"{"'])
+
+    assert result == '{"a": "{"'
+    assert stream.closed